@@ -0,0 +1,4 @@
+# Production async entry point, e.g.: uvicorn asgi:app --workers 4
+from src.asgi import create_asgi_app
+
+app = create_asgi_app()
@@ -0,0 +1,103 @@
+"""Benchmark the annual total queries as voucher_transactions grows.
+
+The queried year keeps a fixed number of rows while older years are filled in,
+so with the date index the ledger range scan (get_ledger_total) should stay flat
+from 10k to 10M rows, and the summary table read (get_annual_total) should stay
+flat regardless of rows per year. Pass --compare to also time the old
+extract('year') predicate.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.annual_total
+    python -m benchmarks.annual_total --sizes 10000 100000 --repeat 50
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault(
+    'DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'uma_bench.db')}"
+)
+
+from sqlalchemy import text
+
+from benchmarks.dataset import reset_database, seed_transactions
+from src.app import create_app
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import (
+    TransactionModel,
+    TransactionRepository
+)
+
+def time_query(query, repeat: int) -> float:
+    """Return median latency of query in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def legacy_total(year: int) -> Decimal:
+    """The pre-index extract('year') predicate, kept for comparison"""
+    return db.session.query(db.func.sum(TransactionModel.amount)).filter(
+        db.extract('year', TransactionModel.transaction_date) == year
+    ).scalar()
+
+def explain(year: int) -> str:
+    """Return the query plan for the ledger range query"""
+    query = db.session.query(db.func.sum(TransactionModel.amount)).filter(
+        TransactionModel.employee_id == '',
+        TransactionModel.transaction_date >= date(year, 1, 1),
+        TransactionModel.transaction_date < date(year + 1, 1, 1)
+    )
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    return '\n'.join(' '.join(str(col) for col in row) for row in db.session.execute(text(prefix + sql)))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--year', type=int, default=date.today().year)
+    parser.add_argument('--year-rows', type=int, default=5000, help='Rows in the queried year')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--compare', action='store_true', help="Also time the extract('year') predicate")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    repository = TransactionRepository()
+    app = create_app()
+
+    with app.app_context():
+        reset_database()
+        seed_transactions(args.year_rows, args.year, args.year, rng)
+
+        rows = args.year_rows
+        print(f"{'rows':>12} {'range ms':>10} {'summary ms':>11}" + (f" {'extract ms':>11}" if args.compare else ''))
+        for size in sorted(args.sizes):
+            seed_transactions(size - rows, args.year - 10, args.year - 1, rng)
+            rows = max(rows, size)
+            if db.engine.dialect.name == 'postgresql':
+                db.session.execute(text('ANALYZE voucher_transactions'))
+                db.session.commit()
+
+            repository.reconcile_annual_totals()
+
+            line = (
+                f"{rows:>12} {time_query(lambda: repository.get_ledger_total(args.year), args.repeat):>10.3f}"
+                f" {time_query(lambda: repository.get_annual_total(args.year), args.repeat):>11.3f}"
+            )
+            if args.compare:
+                line += f" {time_query(lambda: legacy_total(args.year), args.repeat):>11.3f}"
+            print(line)
+
+        print()
+        print(explain(args.year))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Seeded dataset generator shared by the benchmarks.
+
+Every generator takes a random.Random so the same seed produces the same rows
+on SQLite and Postgres. Call these inside an app context.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, Sequence
+
+from sqlalchemy import insert
+
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import (
+    TransactionModel,
+    TransactionRepository
+)
+from src.infrastructure.repositories.uma_repository import UMAValueModel, uma_cache
+
+CHUNK_SIZE = 50000
+
+# Published daily UMA values, extended at 5% a year either side
+KNOWN_UMA = {2016: '73.04', 2017: '75.49', 2018: '80.60', 2019: '84.49', 2020: '86.88',
+             2021: '89.62', 2022: '96.22', 2023: '103.74', 2024: '108.57'}
+GROWTH = Decimal('1.05')
+
+def reset_database() -> None:
+    """Drop and recreate every table"""
+    db.drop_all()
+    db.create_all()
+    uma_cache.invalidate()
+
+def uma_daily_value(year: int) -> Decimal:
+    """Daily UMA for a year, published or extrapolated"""
+    if year in KNOWN_UMA:
+        return Decimal(KNOWN_UMA[year])
+    nearest = min(max(year, min(KNOWN_UMA)), max(KNOWN_UMA))
+    value = Decimal(KNOWN_UMA[nearest])
+    for _ in range(abs(year - nearest)):
+        value = value * GROWTH if year > nearest else value / GROWTH
+    return value.quantize(Decimal('0.01'))
+
+def seed_uma_values(first_year: int, last_year: int) -> int:
+    """Insert one UMA period per year, valid from February 1st"""
+    rows = [
+        {'daily_value': uma_daily_value(year), 'valid_from': date(year, 2, 1)}
+        for year in range(first_year, last_year + 1)
+    ]
+    db.session.execute(insert(UMAValueModel.__table__), rows)
+    db.session.commit()
+    uma_cache.invalidate()
+    return len(rows)
+
+def employee_ids(count: int) -> List[str]:
+    """Stable employee identifiers; the empty string is the shared ledger"""
+    return [''] + [f"EMP{number:06d}" for number in range(1, count)]
+
+def seed_transactions(rows: int, first_year: int, last_year: int, rng: random.Random,
+                      employees: Sequence[str] = ('',)) -> None:
+    """Insert rows spread over [first_year, last_year] in chunks"""
+    start = date(first_year, 1, 1)
+    span = (date(last_year + 1, 1, 1) - start).days
+    while rows > 0:
+        chunk = min(rows, CHUNK_SIZE)
+        db.session.execute(insert(TransactionModel.__table__), [
+            {
+                'amount': Decimal(rng.randint(100, 300000)) / 100,
+                'transaction_date': start + timedelta(days=rng.randrange(span)),
+                'employee_id': rng.choice(employees)
+            }
+            for _ in range(chunk)
+        ])
+        db.session.commit()
+        rows -= chunk
+
+def build(transactions: int, employees: int, years: int, last_year: int, seed: int) -> dict:
+    """Reset the database and seed UMA history plus a ledger with matching annual totals"""
+    rng = random.Random(seed)
+    first_year = last_year - years + 1
+    reset_database()
+    seed_uma_values(first_year - 1, last_year)
+    seed_transactions(transactions, first_year, last_year, rng, employee_ids(employees))
+    TransactionRepository().reconcile_annual_totals()
+    return {
+        'transactions': transactions,
+        'employees': employees,
+        'years': [first_year, last_year],
+        'seed': seed
+    }
+
+def uma_observations(count: int, last_year: int) -> List[dict]:
+    """INEGI-style observations, one per month ending at last_year, newest first"""
+    # Long series repeat the oldest value rather than extrapolating towards zero
+    floor_year = min(KNOWN_UMA) - 10
+    observations = []
+    year, month = last_year, 12
+    for _ in range(count):
+        observations.append({
+            'TIME_PERIOD': f"{year}/{month:02d}",
+            'OBS_VALUE': str(uma_daily_value(max(year, floor_year)))
+        })
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return observations
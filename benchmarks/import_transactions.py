@@ -0,0 +1,106 @@
+"""Throughput benchmark for flask import-transactions.
+
+Writes a seeded CSV or JSON-lines file of historical vouchers, streams it
+through the import pipeline (COPY on Postgres, multi-row INSERT on SQLite)
+and reports rows per second. --baseline-rows also times the same number of
+rows through TransactionRepository.save, one commit per row, for comparison.
+--trace-memory reports peak Python allocations, at a large cost to throughput.
+
+Usage:
+    python -m benchmarks.import_transactions --rows 1000000
+    DATABASE_URL=postgresql://... python -m benchmarks.import_transactions --format jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault(
+    'DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'uma_import.db')}"
+)
+
+from benchmarks.dataset import employee_ids, reset_database
+from src.app import create_app
+from src.application.transaction_import import import_transactions
+from src.domain.models import VoucherTransaction
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+
+def generate_rows(rows: int, years: int, employees: int, rng: random.Random):
+    """Yield (amount, transaction_date, employee_id) tuples"""
+    start = date(date.today().year - years, 1, 1)
+    span = (date(date.today().year, 1, 1) - start).days
+    ids = employee_ids(employees)
+    for _ in range(rows):
+        yield (
+            str(Decimal(rng.randint(100, 300000)) / 100),
+            (start + timedelta(days=rng.randrange(span))).isoformat(),
+            rng.choice(ids)
+        )
+
+def write_file(path: str, file_format: str, rows) -> None:
+    """Write rows without holding them in memory"""
+    with open(path, 'w', newline='') as f:
+        if file_format == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(('amount', 'transaction_date', 'employee_id'))
+            writer.writerows(rows)
+        else:
+            for amount, transaction_date, employee_id in rows:
+                f.write(json.dumps({
+                    'amount': amount, 'transaction_date': transaction_date, 'employee_id': employee_id
+                }) + '\n')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--baseline-rows', type=int, default=2000,
+                        help='Rows to time through the row-at-a-time save path (0 to skip)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Report peak traced memory (slows the import several times over)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), f"uma_import.{args.format}")
+    write_file(path, args.format, generate_rows(args.rows, args.years, args.employees, random.Random(args.seed)))
+
+    app = create_app()
+    repository = TransactionRepository()
+    with app.app_context():
+        reset_database()
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = import_transactions(path, repository, format=args.format, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - started
+        peak = ''
+        if args.trace_memory:
+            peak = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f}"
+            tracemalloc.stop()
+
+        print(f"{'path':>12} {'rows':>10} {'seconds':>8} {'rows/s':>10} {'peak MiB':>9}")
+        print(f"{'import':>12} {result.imported:>10} {elapsed:>8.2f} {result.imported / elapsed:>10.0f} {peak:>9}")
+
+        if args.baseline_rows:
+            rows = generate_rows(args.baseline_rows, args.years, args.employees, random.Random(args.seed))
+            started = time.perf_counter()
+            for amount, transaction_date, employee_id in rows:
+                repository.save(VoucherTransaction(
+                    Decimal(amount), date.fromisoformat(transaction_date), employee_id
+                ))
+            elapsed = time.perf_counter() - started
+            print(f"{'save loop':>12} {args.baseline_rows:>10} {elapsed:>8.2f} {args.baseline_rows / elapsed:>10.0f} {'':>9}")
+
+    os.remove(path)
+
+if __name__ == '__main__':
+    main()
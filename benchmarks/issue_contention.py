@@ -0,0 +1,111 @@
+"""Contention benchmark for POST /api/v1/vouchers/issue.
+
+Many concurrent clients try to issue vouchers for the same year. Afterwards the
+accepted amounts must add up to no more than the annual limit and must match
+both the ledger and the running total.
+
+Usage:
+    # In-process threads against DATABASE_URL (a temporary SQLite file by default)
+    python -m benchmarks.issue_contention --workers 16 --requests 2000
+
+    # Against a running multi-worker server, e.g.
+    #   gunicorn -w 8 "src.app:create_app()"
+    python -m benchmarks.issue_contention --url http://127.0.0.1:8000 --workers 64
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault(
+    'DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'uma_contention.db')}"
+)
+
+import requests
+
+DAILY_UMA = Decimal('108.57')
+
+def issue_local(app, amount: float, day: date):
+    """Issue one voucher through the Flask test client"""
+    client = app.test_client()
+    return lambda: client.post('/api/v1/vouchers/issue', json={
+        'amount': amount, 'transaction_date': day.isoformat()
+    }).status_code
+
+def issue_http(url: str, amount: float, day: date):
+    """Issue one voucher over HTTP, one session per thread"""
+    local = threading.local()
+
+    def issue():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session.post(f"{url}/api/v1/vouchers/issue", json={
+            'amount': amount, 'transaction_date': day.isoformat()
+        }, timeout=30).status_code
+    return issue
+
+def run(issue, workers: int, total: int) -> dict:
+    """Fire total requests from workers threads and tally status codes"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(lambda _: issue(), range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        'accepted': statuses.count(201),
+        'rejected': statuses.count(400),
+        'errors': len(statuses) - statuses.count(201) - statuses.count(400),
+        'seconds': elapsed,
+        'requests_per_second': total / elapsed
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Base URL of a running server; omit to run in-process')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--amount', type=float, default=100.0)
+    parser.add_argument('--year', type=int, default=date.today().year)
+    args = parser.parse_args()
+    day = date(args.year, 6, 1)
+
+    if args.url:
+        before = requests.get(f"{args.url}/api/v1/vouchers/remaining", params={'year': args.year}).json()
+        stats = run(issue_http(args.url, args.amount, day), args.workers, args.requests)
+        after = requests.get(f"{args.url}/api/v1/vouchers/remaining", params={'year': args.year}).json()
+        issued = Decimal(str(before['remaining_limit'])) - Decimal(str(after['remaining_limit']))
+        expected = Decimal(str(args.amount)) * stats['accepted']
+        consistent = after['remaining_limit'] >= 0 and issued == expected
+    else:
+        from benchmarks.dataset import reset_database
+        from src.app import create_app
+        from src.domain.models import UMAValue
+        from src.infrastructure.repositories.transaction_repository import TransactionRepository
+        from src.infrastructure.repositories.uma_repository import UMARepository
+
+        app = create_app()
+        with app.app_context():
+            reset_database()
+            UMARepository().save(UMAValue(DAILY_UMA, date(args.year, 1, 1)))
+
+        stats = run(issue_local(app, args.amount, day), args.workers, args.requests)
+
+        with app.app_context():
+            repository = TransactionRepository()
+            total = repository.get_annual_total(args.year)
+            ledger = repository.get_ledger_total(args.year)
+        limit = DAILY_UMA * Decimal('30.4') * 7
+        expected = Decimal(str(args.amount)) * stats['accepted']
+        consistent = total <= limit and total == ledger == expected
+
+    for key, value in stats.items():
+        print(f"{key:>20}: {value:.2f}" if isinstance(value, float) else f"{key:>20}: {value}")
+    print(f"{'consistent':>20}: {consistent}")
+    if not consistent:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
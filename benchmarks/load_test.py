@@ -0,0 +1,90 @@
+"""HTTP load test comparing p50/p99 latency and throughput across servers.
+
+Start the servers to compare against the same database, for example:
+    gunicorn -w 4 --threads 8 -b 127.0.0.1:5000 "src.app:create_app()"
+    uvicorn asgi:app --workers 4 --port 8000
+
+Then run:
+    python -m benchmarks.load_test --target sync=http://127.0.0.1:5000 \\
+        --target async=http://127.0.0.1:8000 --concurrency 64 --duration 30
+"""
+import argparse
+import itertools
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+REQUESTS = [
+    ('GET', '/api/v1/uma', None),
+    ('POST', '/api/v1/vouchers/validate', {'amount': 1000.0}),
+    ('GET', '/api/v1/vouchers/remaining', None)
+]
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return float('nan')
+    rank = max(0, min(len(samples) - 1, round(pct / 100 * len(samples)) - 1))
+    return samples[rank]
+
+def worker(base_url: str, deadline: float, latencies: list, errors: list) -> None:
+    """Cycle through the v1 routes until the deadline, recording latencies"""
+    session = requests.Session()
+    local, failed = [], 0
+    for method, path, body in itertools.cycle(REQUESTS):
+        if time.perf_counter() >= deadline:
+            break
+        started = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, json=body, timeout=10)
+            if response.status_code >= 500:
+                failed += 1
+        except requests.RequestException:
+            failed += 1
+        local.append((time.perf_counter() - started) * 1000)
+    latencies.extend(local)
+    errors.append(failed)
+
+def run(base_url: str, concurrency: int, duration: float) -> dict:
+    """Drive one server with concurrency clients for duration seconds"""
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker, base_url, deadline, latencies, errors)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'mean_ms': statistics.fmean(latencies) if latencies else float('nan'),
+        'requests_per_second': len(latencies) / elapsed
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', action='append', required=True,
+                        help='name=base_url, repeat for each server to compare')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'target':>10} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>9}")
+    for target in args.target:
+        name, base_url = target.split('=', 1)
+        base_url = base_url.rstrip('/')
+        run(base_url, args.concurrency, args.warmup)
+        stats = run(base_url, args.concurrency, args.duration)
+        print(
+            f"{name:>10} {stats['requests']:>9} {stats['errors']:>7} {stats['p50_ms']:>8.2f}"
+            f" {stats['p99_ms']:>8.2f} {stats['requests_per_second']:>9.1f}"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Benchmark suite for the voucher hot path.
+
+Seeds a reproducible dataset, then times VoucherService.validate_voucher and
+get_annual_remaining, the full Flask request cycle for /uma,
+/vouchers/validate and /vouchers/remaining, and INEGIService parsing of a
+large observation series. Results are written as JSON so runs from two
+commits can be diffed with --baseline.
+
+Usage:
+    python -m benchmarks.run --output before.json
+    DATABASE_URL=postgresql://... python -m benchmarks.run --output after.json --baseline before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import timeit
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict
+
+os.environ.setdefault(
+    'DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'uma_suite.db')}"
+)
+os.environ.setdefault('INEGI_API_KEY', 'benchmark')
+
+import requests
+
+from benchmarks import dataset
+from src.app import create_app
+from src.infrastructure.database import db
+from src.infrastructure.services.inegi_service import INEGIService
+from src.interfaces.api.routes import uma_repository, voucher_service
+
+EMPLOYEE_ID = 'EMP000001'
+
+def measure(func: Callable[[], object], number: int, repeat: int) -> Dict[str, float]:
+    """Time func and return best and median per-call microseconds"""
+    func()
+    samples = [total / number * 1e6 for total in timeit.Timer(func).repeat(repeat=repeat, number=number)]
+    return {
+        'best_us': min(samples),
+        'median_us': statistics.median(samples),
+        'number': number,
+        'repeat': repeat
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def inegi_service(observations: int, last_year: int) -> INEGIService:
+    """INEGIService whose session returns a canned series of observations"""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(
+        {'Series': [{'OBSERVATIONS': dataset.uma_observations(observations, last_year)}]}
+    ).encode()
+    service = INEGIService(uma_repository)
+    service.session.get = lambda *args, **kwargs: response
+    return service
+
+def cases(app, args) -> Dict[str, Callable[[], object]]:
+    """Name each measured call"""
+    client = app.test_client()
+    amount = Decimal('1000.00')
+    service = inegi_service(args.observations, args.year)
+    observations = dataset.uma_observations(args.observations, args.year)
+
+    def request(method, path, **kwargs):
+        def call():
+            response = client.open(path, method=method, **kwargs)
+            assert response.status_code == 200, response.get_data(as_text=True)
+        return call
+
+    return {
+        'service.validate_voucher': lambda: voucher_service.validate_voucher(amount, employee_id=EMPLOYEE_ID),
+        'service.get_annual_remaining': lambda: voucher_service.get_annual_remaining(employee_id=EMPLOYEE_ID),
+        'http.get_uma': request('GET', '/api/v1/uma'),
+        'http.validate_voucher': request('POST', '/api/v1/vouchers/validate',
+                                         json={'amount': 1000.0, 'employee_id': EMPLOYEE_ID}),
+        'http.get_remaining': request('GET', '/api/v1/vouchers/remaining',
+                                      query_string={'employee_id': EMPLOYEE_ID}),
+        'inegi.parse_observations': lambda: [service._parse_observation(obs) for obs in observations],
+        'inegi.latest_value': service._get_latest_value
+    }
+
+def compare(results: dict, baseline_path: str) -> None:
+    """Print the change against a previous run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print()
+    print(f"vs {baseline['meta']['revision']} ({baseline_path})")
+    print(f"{'case':>30} {'before us':>10} {'after us':>10} {'change':>8}")
+    for name, result in results.items():
+        before = baseline['results'].get(name)
+        if before:
+            change = (result['best_us'] / before['best_us'] - 1) * 100
+            print(f"{name:>30} {before['best_us']:>10.2f} {result['best_us']:>10.2f} {change:>+7.1f}%")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--transactions', type=int, default=100_000)
+    parser.add_argument('--employees', type=int, default=1000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--year', type=int, default=date.today().year)
+    parser.add_argument('--observations', type=int, default=5000, help='INEGI series length')
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', nargs='+', help='Run only these case names')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Previous JSON results to compare against')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        data = dataset.build(args.transactions, args.employees, args.years, args.year, args.seed)
+        data['observations'] = args.observations
+
+        results = {}
+        print(f"{'case':>30} {'best us':>10} {'median us':>10}")
+        for name, func in cases(app, args).items():
+            if args.only and name not in args.only:
+                continue
+            number = max(1, args.number // 20) if name.startswith('inegi.') else args.number
+            results[name] = measure(func, number, args.repeat)
+            print(f"{name:>30} {results[name]['best_us']:>10.2f} {results[name]['median_us']:>10.2f}")
+
+        report = {
+            'meta': {
+                'revision': git_revision(),
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'database': db.engine.dialect.name,
+                'dataset': data
+            },
+            'results': results
+        }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark CPU per request with and without the fast serialization path.
+
+Serves /uma, /vouchers/validate and /vouchers/remaining through the Flask
+test client from two apps over the same seeded database, one using
+marshmallow via flask_apispec and one with FAST_SERIALIZATION enabled, and
+reports process CPU time per request.
+
+Usage:
+    python -m benchmarks.serialization --number 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+
+os.environ.setdefault(
+    'DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'uma_serialization.db')}"
+)
+
+from benchmarks import dataset
+from src.app import create_app
+
+EMPLOYEE_ID = 'EMP000001'
+
+REQUESTS = {
+    'get_uma': ('GET', '/api/v1/uma', {}),
+    'validate_voucher': ('POST', '/api/v1/vouchers/validate',
+                         {'json': {'amount': 1000.0, 'employee_id': EMPLOYEE_ID}}),
+    'validate_rejected': ('POST', '/api/v1/vouchers/validate',
+                          {'json': {'amount': 3000.0, 'employee_id': EMPLOYEE_ID}}),
+    'get_remaining': ('GET', '/api/v1/vouchers/remaining', {'query_string': {'employee_id': EMPLOYEE_ID}})
+}
+
+def build_app(fast: bool):
+    os.environ['FAST_SERIALIZATION'] = '1' if fast else '0'
+    return create_app()
+
+def cpu_per_request(client, method: str, path: str, kwargs: dict, number: int, repeat: int) -> float:
+    """Return the best process CPU time per request in microseconds"""
+    client.open(path, method=method, **kwargs)
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(number):
+            client.open(path, method=method, **kwargs)
+        samples.append((time.process_time() - started) / number * 1e6)
+    return min(samples)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--transactions', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    slow_app, fast_app = build_app(False), build_app(True)
+    with slow_app.app_context():
+        dataset.build(args.transactions, 100, 2, date.today().year, args.seed)
+
+    print(f"{'route':>18} {'marshmallow us':>15} {'fast us':>8} {'saved us':>9}")
+    for name, (method, path, kwargs) in REQUESTS.items():
+        with slow_app.app_context():
+            before = cpu_per_request(slow_app.test_client(), method, path, kwargs, args.number, args.repeat)
+        with fast_app.app_context():
+            after = cpu_per_request(fast_app.test_client(), method, path, kwargs, args.number, args.repeat)
+        print(f"{name:>18} {before:>15.1f} {after:>8.1f} {before - after:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of the vectorized limit simulator against a per-scenario VoucherLimits loop.
+
+Generates seeded candidate daily UMA values and monthly deposit plans, then
+times simulate() and the same evaluation written one Decimal VoucherLimits
+at a time.
+
+Usage:
+    python -m benchmarks.simulator --scenarios 100000 --plans 5
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from src.application.simulator import simulate
+from src.domain.models import VoucherLimits
+
+def decimal_loop(daily_values, plans) -> None:
+    """Evaluate every plan under every scenario with Decimal limits"""
+    plans = [(employee_id, [Decimal(str(amount)) for amount in deposits]) for employee_id, deposits in plans]
+    for daily_value in daily_values:
+        limits = VoucherLimits(Decimal(str(daily_value)))
+        for _, deposits in plans:
+            running = Decimal('0')
+            for amount in deposits:
+                running += amount
+                if amount > limits.monthly_uma or running > limits.max_annual_amount:
+                    break
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', type=int, default=100_000)
+    parser.add_argument('--plans', type=int, default=5)
+    parser.add_argument('--deposits', type=int, default=12, help='Deposits per plan')
+    parser.add_argument('--loop-scenarios', type=int, default=10_000,
+                        help='Scenarios to time through the Decimal loop (0 to skip)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    daily_values = [rng.randint(8000, 20000) / 100 for _ in range(args.scenarios)]
+    plans = [
+        (f"EMP{i:06d}", [rng.randint(10000, 400000) / 100 for _ in range(args.deposits)])
+        for i in range(args.plans)
+    ]
+
+    print(f"{'path':>12} {'scenarios':>10} {'seconds':>8} {'scenarios/s':>12}")
+    started = time.perf_counter()
+    simulate(daily_values, plans)
+    elapsed = time.perf_counter() - started
+    print(f"{'vectorized':>12} {args.scenarios:>10} {elapsed:>8.3f} {args.scenarios / elapsed:>12.0f}")
+
+    if args.loop_scenarios:
+        started = time.perf_counter()
+        decimal_loop(daily_values[:args.loop_scenarios], plans)
+        elapsed = time.perf_counter() - started
+        print(f"{'decimal loop':>12} {args.loop_scenarios:>10} {elapsed:>8.3f} {args.loop_scenarios / elapsed:>12.0f}")
+
+if __name__ == '__main__':
+    main()
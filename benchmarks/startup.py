@@ -0,0 +1,61 @@
+"""Cold-start benchmark: time from a fresh interpreter to the first served request.
+
+Each sample runs in a new subprocess so imports are not shared. Phases are
+importing src.app, create_app(), the first /api/v1/uma request and the first
+/swagger/ request (which builds the OpenAPI spec lazily).
+
+Usage:
+    python -m benchmarks.startup --runs 10
+    APP_ENV=production python -m benchmarks.startup   # skip create_all
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = '''
+import json, time
+started = time.perf_counter()
+from src.app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+client = app.test_client()
+client.get('/api/v1/uma')
+first_request = time.perf_counter()
+client.get('/swagger/')
+swagger = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'first_request_ms': (first_request - created) * 1000,
+    'ready_ms': (first_request - started) * 1000,
+    'first_swagger_ms': (swagger - first_request) * 1000
+}))
+'''
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'uma_startup.db')}")
+
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE], env=env, check=True,
+            capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    for phase in samples[0]:
+        values = [sample[phase] for sample in samples]
+        print(f"{phase:>18}: median {statistics.median(values):8.2f} ms  max {max(values):8.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Micro-benchmark of the VoucherService.validate_voucher hot path.
+
+Runs validate_voucher against in-memory repositories so only the service and
+limits math is measured, first with VoucherLimits recomputed on every
+construction (the behaviour before limits were memoized) and then with the
+memoized, immutable VoucherLimits.
+
+Usage:
+    python -m benchmarks.validate_hot_path --number 100000
+"""
+import argparse
+import timeit
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from src.application.services import VoucherService
+from src.domain import models
+from src.domain.models import UMAValue
+
+class LegacyVoucherLimits:
+    """VoucherLimits as it was before memoization, recomputed on every call"""
+    def __init__(self, daily_uma: Decimal):
+        self.daily_uma = daily_uma
+        self.monthly_uma = daily_uma * Decimal('30.4')
+        self.annual_max_deposits = 7
+        self.max_monthly_amount = self.monthly_uma
+        self.max_annual_amount = self.monthly_uma * Decimal(str(self.annual_max_deposits))
+
+class InMemoryUMARepository:
+    def __init__(self, value: UMAValue):
+        self.value = value
+
+    def get_current_value(self) -> UMAValue:
+        return self.value
+
+class InMemoryTransactionRepository:
+    def get_annual_total(self, year: int, employee_id: str = '') -> Decimal:
+        return Decimal('12000.00')
+
+def measure(service: VoucherService, amount: Decimal, number: int, repeat: int) -> float:
+    """Return the best per-call time in microseconds"""
+    timer = timeit.Timer(lambda: service.validate_voucher(amount))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    service = VoucherService(
+        InMemoryUMARepository(UMAValue(Decimal('108.57'), date(2024, 2, 1))),
+        InMemoryTransactionRepository()
+    )
+    cases = {'accepted': Decimal('1000.00'), 'rejected': Decimal('20000.00')}
+
+    print(f"{'case':>10} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for name, amount in cases.items():
+        with mock.patch.object(models, 'VoucherLimits', LegacyVoucherLimits):
+            before = measure(service, amount, args.number, args.repeat)
+        after = measure(service, amount, args.number, args.repeat)
+        print(f"{name:>10} {before:>10.2f} {after:>10.2f} {before / after:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
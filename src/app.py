@@ -1,25 +1,103 @@
 import os
+from typing import Optional
 from flask import Flask
-from apispec import APISpec
-from apispec.ext.marshmallow import MarshmallowPlugin
-from flask_apispec.extension import FlaskApiSpec
 
 from src.infrastructure.database import db
+from src.infrastructure.idempotency import install_idempotency
+from src.infrastructure.metrics import instrument_engine
+from src.infrastructure.pool import configure_engine, engine_options_from_env
+from src.infrastructure.profiling import install_profiling
+from src.infrastructure.replicas import ReplicaRouter, replica_binds_from_env
+from src.infrastructure.services.uma_refresher import UMARefresher
 from src.interfaces.api import api
-from src.interfaces.cli.commands import update_uma_command
+from src.interfaces.ops import ops
+from src.interfaces.cli.commands import (
+    init_db_command,
+    update_uma_command,
+    backfill_uma_command,
+    reconcile_totals_command,
+    import_transactions_command,
+    simulate_limits_command,
+    profile_top_command
+)
 
-docs = FlaskApiSpec()
+def create_app(create_tables: Optional[bool] = None):
+    """Build the Flask app.
 
-def create_app():
+    Tables are created on startup unless create_tables is False or, by
+    default, APP_ENV is 'production', where `flask init-db` is run once at
+    deploy time instead.
+    """
     app = Flask(__name__)
     
     # Configure database
     app.config["SQLALCHEMY_DATABASE_URI"] = os.environ["DATABASE_URL"]
-    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-        "pool_recycle": 300,
-        "pool_pre_ping": True
-    }
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options_from_env(
+        app.config["SQLALCHEMY_DATABASE_URI"]
+    )
+    app.config["SQLALCHEMY_BINDS"] = replica_binds_from_env(engine_options_from_env)
     
+    # Initialize extensions
+    db.init_app(app)
+    # Replicas hold no models of their own; drop the empty metadata init_app
+    # makes for each bind so create_all and drop_all never touch them
+    for key in app.config["SQLALCHEMY_BINDS"]:
+        db.metadatas.pop(key, None)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_engine(engine)
+            instrument_engine(engine)
+    # Replica lag is measured in the background, started by the first request
+    # like the UMA refresher below
+    router = ReplicaRouter.from_env(app.config["SQLALCHEMY_BINDS"])
+    if router:
+        app.extensions['replicas'] = router
+        app.before_request(lambda: router.ensure_started(db.engines))
+    
+    # Register blueprints
+    app.register_blueprint(api, url_prefix='/api/v1')
+    app.register_blueprint(ops)
+    if os.environ.get('FAST_SERIALIZATION', '').lower() in ('1', 'true', 'yes', 'on'):
+        from src.interfaces.api.fast import install_fast_paths
+        install_fast_paths(app)
+    install_profiling(app)
+    install_idempotency(app)
+    
+    # Refresh UMA values in the background; started by the first request so
+    # CLI commands and preforked workers don't inherit a thread
+    refresher = UMARefresher.from_env(app)
+    if refresher:
+        app.extensions['uma_refresher'] = refresher
+        app.before_request(refresher.ensure_started)
+    
+    # Initialize docs after registering blueprints
+    init_docs(app)
+    
+    # Register CLI commands
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(update_uma_command)
+    app.cli.add_command(backfill_uma_command)
+    app.cli.add_command(reconcile_totals_command)
+    app.cli.add_command(import_transactions_command)
+    app.cli.add_command(simulate_limits_command)
+    app.cli.add_command(profile_top_command)
+    
+    # Create database tables
+    if create_tables is None:
+        create_tables = os.environ.get('APP_ENV', 'development') != 'production'
+    if create_tables:
+        with app.app_context():
+            db.create_all()
+    
+    return app
+
+def init_docs(app):
+    """Register API documentation; the spec itself is built on the first /swagger/ hit"""
+    from apispec import APISpec
+    from apispec.ext.marshmallow import MarshmallowPlugin
+    from src.interfaces.api.docs import LazyFlaskApiSpec
+    from src.interfaces.api.routes import register_api_documentation
+
     # Configure API documentation
     app.config.update({
         'APISPEC_SPEC': APISpec(
@@ -35,26 +113,15 @@ def create_app():
         'APISPEC_SWAGGER_UI_URL': '/swagger-ui/'
     })
     
-    # Initialize extensions
-    db.init_app(app)
-    
-    # Register blueprints
-    app.register_blueprint(api, url_prefix='/api/v1')
-    
-    # Initialize docs after registering blueprints
-    docs.init_app(app)
-    
-    # Register CLI commands
-    app.cli.add_command(update_uma_command)
-    
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-        
-        # Register API documentation
-        from src.interfaces.api.routes import register_api_documentation
-        register_api_documentation(docs)
-    
-    return app
+    docs = LazyFlaskApiSpec(app)
+    register_api_documentation(docs)
+    app.extensions['apispec'] = docs
+    return docs
 
-app = create_app()
+def __getattr__(name):
+    # Keep `from src.app import app` working without building an app on import
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,68 +1,183 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple
 
-from src.domain.exceptions import InvalidAmountError, LimitExceededError
-from src.domain.models import VoucherLimits
+from src.domain.exceptions import InvalidAmountError, LimitExceededError, UMANotFoundError, VoucherError
+from src.domain.models import LimitsSnapshot, UMAValue, VoucherLimits, VoucherTransaction
 
 class VoucherService:
     def __init__(self, uma_repository, transaction_repository):
         self.uma_repository = uma_repository
         self.transaction_repository = transaction_repository
 
+    def get_uma(self, on: Optional[date] = None) -> UMAValue:
+        """Get the UMA value in effect on a date, or the current one"""
+        if on:
+            uma = self.uma_repository.get_value_at(on)
+        else:
+            uma = self.uma_repository.get_current_value()
+
+        if uma is None:
+            raise UMANotFoundError(f"No UMA value found for {on}" if on else "No UMA value found")
+        return uma
+
     def validate_amount(self, amount: Decimal) -> None:
         """Validate if amount is positive"""
         if amount <= 0:
             raise InvalidAmountError("Invalid amount")
 
-    def check_monthly_limit(self, amount: Decimal) -> None:
+    def check_monthly_limit(self, amount: Decimal, on: Optional[date] = None) -> None:
         """Check if amount exceeds monthly UMA limit"""
-        current_uma = self.uma_repository.get_current_value()
-        limits = VoucherLimits(current_uma.daily_value)
+        limits = self.get_uma(on).limits
         
         if amount > limits.monthly_uma:
             raise LimitExceededError(
                 f"Amount exceeds monthly UMA limit of {limits.monthly_uma:.2f} MXN"
             )
 
-    def get_annual_remaining(self, year: Optional[int] = None) -> Decimal:
-        """Calculate remaining annual limit"""
+    def get_annual_limits(self, year: int) -> VoucherLimits:
+        """Limits a year's vouchers are held to"""
+        # Past years are limited by the UMA that was in effect at their close
+        return self.get_uma(date(year, 12, 31) if year < datetime.now().year else None).limits
+
+    def get_annual_remaining(self, year: Optional[int] = None, employee_id: str = '') -> Decimal:
+        """Calculate remaining annual limit for an employee"""
         year = year or datetime.now().year
-        current_uma = self.uma_repository.get_current_value()
-        limits = VoucherLimits(current_uma.daily_value)
+        limits = self.get_annual_limits(year)
         
-        used = self.transaction_repository.get_annual_total(year)
+        used = self.transaction_repository.get_annual_total(year, employee_id)
         return limits.max_annual_amount - used
 
-    def validate_voucher(self, amount: Decimal) -> Dict:
-        """Validate if voucher amount is within limits"""
+    def export_ledger(self, year: int) -> Iterator[Dict]:
+        """Stream a year's vouchers with each employee's cumulative usage against the annual limit.
+
+        Limits are resolved before the first row so a missing UMA raises
+        here rather than part way through a response.
+        """
+        limits = self.get_annual_limits(year)
+        return self._with_usage(self.transaction_repository.iter_year(year), limits.max_annual_amount)
+
+    def _with_usage(self, rows: Iterable[Tuple[str, date, Decimal]], limit: Decimal) -> Iterator[Dict]:
+        """Annotate ledger rows, ordered by employee, with running totals"""
+        employee = None
+        cumulative = Decimal('0')
+        for employee_id, transaction_date, amount in rows:
+            if employee_id != employee:
+                employee = employee_id
+                cumulative = Decimal('0')
+            cumulative += amount
+            yield {
+                'employee_id': employee_id,
+                'transaction_date': transaction_date,
+                'amount': amount,
+                'cumulative_amount': cumulative,
+                'annual_limit': limit,
+                'remaining': limit - cumulative,
+                'over_limit': cumulative > limit
+            }
+
+    def get_limits_snapshot(self, employee_id: str = '',
+                            transaction_date: Optional[date] = None) -> LimitsSnapshot:
+        """Load the UMA on the transaction date, the year's limits and the employee's usage for it"""
+        uma = self.get_uma(transaction_date)
+        year = transaction_date.year if transaction_date else datetime.now().year
+        used = self.transaction_repository.get_annual_total(year, employee_id)
+        return LimitsSnapshot(uma, year, used, self._annual_limits(uma, transaction_date, year))
+
+    def _annual_limits(self, uma: UMAValue, transaction_date: Optional[date], year: int) -> VoucherLimits:
+        """The year's limits, reusing uma when it is already the one get_annual_limits would pick"""
+        if transaction_date is None:
+            return uma.limits
+        return self.get_annual_limits(year)
+
+    def _result(self, snapshot: LimitsSnapshot, amount: Decimal, message: Optional[str] = None) -> Dict:
+        """Build a validation result from a snapshot"""
+        result = {
+            'is_valid': message is None,
+            'current_amount': amount,
+            'limit': snapshot.annual_limits.max_annual_amount,
+            'remaining': snapshot.remaining
+        }
+        if message is not None:
+            result['message'] = message
+        return result
+
+    def validate_vouchers(self, vouchers: List[Tuple[Decimal, Optional[date], str]]) -> List[Dict]:
+        """Validate many (amount, date, employee) vouchers with one annual total query per year"""
+        current_year = datetime.now().year
+
+        employees_by_year = {}
+        for _, transaction_date, employee_id in vouchers:
+            year = transaction_date.year if transaction_date else current_year
+            employees_by_year.setdefault(year, set()).add(employee_id)
+        used_by_year = {
+            year: self.transaction_repository.get_annual_totals(year, employee_ids)
+            for year, employee_ids in employees_by_year.items()
+        }
+
+        results = []
+        annual_limits_by_year = {}
+        for amount, transaction_date, employee_id in vouchers:
+            year = transaction_date.year if transaction_date else current_year
+            try:
+                uma = self.get_uma(transaction_date)
+                if year not in annual_limits_by_year:
+                    annual_limits_by_year[year] = self.get_annual_limits(year)
+            except UMANotFoundError as e:
+                results.append({'is_valid': False, 'current_amount': amount, 'message': str(e)})
+                continue
+            snapshot = LimitsSnapshot(uma, year, used_by_year[year][employee_id], annual_limits_by_year[year])
+
+            try:
+                self.validate_amount(amount)
+                snapshot.check(amount)
+            except VoucherError as e:
+                results.append(self._result(snapshot, amount, str(e)))
+                continue
+            results.append(self._result(snapshot, amount))
+
+        return results
+
+    def issue_voucher(self, amount: Decimal, transaction_date: Optional[date] = None,
+                      employee_id: str = '') -> Dict:
+        """Record a voucher if it is within limits, reserving the annual amount atomically"""
+        uma = self.get_uma(transaction_date)
+        year = (transaction_date or date.today()).year
+        limits = self._annual_limits(uma, transaction_date, year)
+        transaction_date = transaction_date or date.today()
+
         try:
             self.validate_amount(amount)
-            self.check_monthly_limit(amount)
-            
-            remaining = self.get_annual_remaining()
-            current_uma = self.uma_repository.get_current_value()
-            limits = VoucherLimits(current_uma.daily_value)
-            
-            if amount > remaining:
+            # Usage is checked by the reservation itself, so nothing is read up front
+            LimitsSnapshot(uma, year, Decimal('0'), limits).check(amount)
+            total = self.transaction_repository.reserve(
+                VoucherTransaction(
+                    amount=amount, transaction_date=transaction_date, employee_id=employee_id
+                ),
+                limits.max_annual_amount
+            )
+            if total is None:
                 raise LimitExceededError(
                     f"Amount would exceed annual UMA limit of {limits.max_annual_amount:.2f} MXN"
                 )
+            return self._result(LimitsSnapshot(uma, year, total, limits), amount)
 
-            return {
-                'is_valid': True,
-                'current_amount': amount,
-                'limit': limits.max_annual_amount,
-                'remaining': remaining
-            }
+        except VoucherError as e:
+            used = self.transaction_repository.get_annual_total(year, employee_id)
+            return self._result(LimitsSnapshot(uma, year, used, limits), amount, str(e))
 
-        except LimitExceededError as e:
-            current_uma = self.uma_repository.get_current_value()
-            limits = VoucherLimits(current_uma.daily_value)
-            return {
-                'is_valid': False,
-                'current_amount': amount,
-                'limit': limits.max_annual_amount,
-                'remaining': self.get_annual_remaining(),
-                'message': str(e)
-            }
+    def validate_voucher(self, amount: Decimal, employee_id: str = '',
+                         transaction_date: Optional[date] = None) -> Dict:
+        """Validate if voucher amount is within limits on its transaction date.
+
+        The UMA and annual usage are loaded once into a snapshot, and both
+        accepted and rejected results are built from it. The snapshot comes
+        first so a date without a UMA is a UMANotFoundError for any amount.
+        """
+        snapshot = self.get_limits_snapshot(employee_id, transaction_date)
+        try:
+            self.validate_amount(amount)
+            snapshot.check(amount)
+        except (InvalidAmountError, LimitExceededError) as e:
+            return self._result(snapshot, amount, str(e))
+        return self._result(snapshot, amount)
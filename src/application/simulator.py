@@ -0,0 +1,94 @@
+from typing import Dict, List, Sequence, Tuple
+
+from src.application.transaction_import import MAX_AMOUNT
+
+# Limits are exact in tenths of a cent: a daily UMA in cents times 304
+# (the 30.4 days of a month) is the monthly cap in those units
+SCALE = 10
+MONTH_FACTOR = 304
+ANNUAL_DEPOSITS = 7
+
+# Bound on scenarios x plans so one request cannot exhaust memory
+MAX_CELLS = 5_000_000
+
+def _numpy():
+    """Import NumPy on first use; it is only needed by the simulator"""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("The limit simulator needs NumPy; install it with pip install '.[simulate]'")
+    return numpy
+
+def to_cents(values: Sequence[float], what: str):
+    """Convert positive amounts up to MAX_AMOUNT with at most two decimals to an int64 array of cents"""
+    np = _numpy()
+    try:
+        amounts = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        amounts = None
+    if amounts is None or amounts.ndim != 1 or not amounts.size:
+        raise ValueError(f"Expected a non-empty list of {what}s")
+    cents = np.rint(amounts * 100)
+    bad = ~np.isfinite(amounts) | (amounts <= 0) | (np.abs(amounts * 100 - cents) > 1e-9 * np.maximum(1, cents))
+    if bad.any():
+        index = int(np.argmax(bad))
+        raise ValueError(f"Invalid {what} {values[index]!r}; amounts must be positive with at most two decimals")
+    # Keeps cents, caps and running totals well inside int64
+    too_large = amounts > float(MAX_AMOUNT)
+    if too_large.any():
+        index = int(np.argmax(too_large))
+        raise ValueError(f"Invalid {what} {values[index]!r}; amounts must be at most {MAX_AMOUNT}")
+    return cents.astype(np.int64)
+
+def round_half_even(values, scale: int = SCALE):
+    """Round integers in 1/scale cent units to whole cents, ties to even, like Decimal.quantize"""
+    np = _numpy()
+    quotient, remainder = np.divmod(values, scale)
+    half = scale // 2
+    up = (remainder > half) | ((remainder == half) & (quotient % 2 == 1))
+    return quotient + up
+
+def _pesos(cents) -> List[float]:
+    return (cents / 100).tolist()
+
+def _breaches(index, deposits: int) -> List:
+    """1-based deposit numbers, None where the plan never breaches"""
+    return [None if i == deposits else i + 1 for i in index.tolist()]
+
+def simulate(daily_values: Sequence[float], plans: Sequence[Tuple[str, Sequence[float]]]) -> Dict:
+    """Evaluate every deposit plan against every candidate daily UMA value at once.
+
+    Caps and comparisons use exact integer arithmetic, so they agree with
+    VoucherLimits and LimitsSnapshot.check; caps are reported rounded half
+    even to the cent. For each plan and scenario the result gives the first
+    deposit above the monthly cap and the first that takes the running total
+    above the annual cap, matching how a voucher would be rejected.
+    """
+    np = _numpy()
+    daily = to_cents(daily_values, 'daily UMA value')
+    if len(daily) * len(plans) > MAX_CELLS:
+        raise ValueError(f"At most {MAX_CELLS} scenario and plan combinations per simulation")
+
+    monthly_exact = daily * MONTH_FACTOR
+    annual_exact = monthly_exact * ANNUAL_DEPOSITS
+
+    results = []
+    for employee_id, deposits in plans:
+        amounts = to_cents(deposits, 'deposit')
+        # Both sequences are non-decreasing, so each scenario's first breach is a binary search
+        largest = np.maximum.accumulate(amounts) * SCALE
+        running = np.cumsum(amounts) * SCALE
+        results.append({
+            'employee_id': employee_id,
+            'total': int(amounts.sum()) / 100,
+            'remaining': _pesos(round_half_even(annual_exact - running[-1])),
+            'monthly_breach': _breaches(np.searchsorted(largest, monthly_exact, side='right'), len(amounts)),
+            'annual_breach': _breaches(np.searchsorted(running, annual_exact, side='right'), len(amounts))
+        })
+
+    return {
+        'daily_value': _pesos(daily),
+        'monthly_cap': _pesos(round_half_even(monthly_exact)),
+        'annual_cap': _pesos(round_half_even(annual_exact)),
+        'plans': results
+    }
@@ -0,0 +1,118 @@
+import csv
+import json
+import os
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Largest amount voucher_transactions.amount (NUMERIC(10, 2)) can hold
+MAX_AMOUNT = Decimal('99999999.99')
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl'
+}
+
+class ImportResult:
+    """Counts and the first few row errors from one import"""
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+def detect_format(path: str) -> str:
+    """Infer csv or jsonl from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot tell the format of {path}; pass --format csv or jsonl")
+    return FORMATS[extension]
+
+def read_rows(path: str, format: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (line number, raw row) pairs one at a time"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if format == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    yield line, json.loads(text, parse_float=Decimal)
+                except ValueError as e:
+                    yield line, {'_error': f"Invalid JSON: {str(e)}"}
+
+def parse_row(row: Dict) -> Dict:
+    """Validate one raw row into voucher_transactions column values"""
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+    if '_error' in row:
+        raise ValueError(row['_error'])
+
+    try:
+        amount = Decimal(str(row.get('amount', '')).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount {row.get('amount')!r}")
+    if not amount.is_finite() or amount <= 0:
+        raise ValueError(f"Invalid amount {row.get('amount')!r}")
+    if amount.as_tuple().exponent < -2:
+        raise ValueError(f"Amount {amount} has more than two decimal places")
+    if amount > MAX_AMOUNT:
+        raise ValueError(f"Amount {amount} is too large")
+
+    try:
+        transaction_date = date.fromisoformat(str(row.get('transaction_date', '')).strip())
+    except ValueError:
+        raise ValueError(f"Invalid transaction_date {row.get('transaction_date')!r}")
+
+    raw_employee_id = row.get('employee_id') or ''
+    if not isinstance(raw_employee_id, str):
+        raise ValueError(f"Invalid employee_id {raw_employee_id!r}")
+    # An ID given as only whitespace must not land in the shared '' ledger
+    employee_id = raw_employee_id.strip()
+    if len(employee_id) > 64 or (raw_employee_id and not employee_id):
+        raise ValueError(f"Invalid employee_id {raw_employee_id!r}")
+
+    return {'amount': amount, 'transaction_date': transaction_date, 'employee_id': employee_id}
+
+def validated_chunks(rows: Iterable[Tuple[int, Dict]], chunk_size: int,
+                     result: ImportResult) -> Iterator[List[Dict]]:
+    """Group rows into chunks of valid rows, recording invalid ones on result"""
+    rows = iter(rows)
+    while True:
+        raw = list(islice(rows, chunk_size))
+        if not raw:
+            return
+        chunk = []
+        for line, row in raw:
+            try:
+                chunk.append(parse_row(row))
+            except ValueError as e:
+                result.add_error(line, str(e))
+        if chunk:
+            yield chunk
+
+def import_transactions(path: str, transaction_repository, format: Optional[str] = None,
+                        chunk_size: int = 5000, dry_run: bool = False) -> ImportResult:
+    """Stream a CSV or JSON-lines file into the ledger, one chunk per transaction.
+
+    Memory use is bounded by chunk_size. Each chunk's rows and its
+    annual total increments commit together, so totals always match the
+    ledger, even if an import is interrupted.
+    """
+    result = ImportResult()
+    rows = read_rows(path, format or detect_format(path))
+    for chunk in validated_chunks(rows, chunk_size, result):
+        if not dry_run:
+            transaction_repository.bulk_insert(chunk)
+        result.imported += len(chunk)
+    return result
@@ -0,0 +1,24 @@
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+
+from src.infrastructure.async_database import create_engine_from_env
+from src.infrastructure.repositories.async_repositories import (
+    AsyncTransactionRepository,
+    AsyncUMARepository
+)
+from src.interfaces.asgi.routes import routes
+
+@asynccontextmanager
+async def lifespan(app):
+    # One async engine (and pool) per worker process
+    engine = create_engine_from_env()
+    app.state.uma_repository = AsyncUMARepository(engine)
+    app.state.transaction_repository = AsyncTransactionRepository(engine)
+    try:
+        yield
+    finally:
+        await engine.dispose()
+
+def create_asgi_app():
+    """Serve the read and validate v1 routes on an async stack"""
+    return Starlette(routes=routes, lifespan=lifespan)
@@ -16,3 +16,8 @@ class LimitExceededError(VoucherError):
 class InvalidAmountError(VoucherError):
     """Raised when amount is invalid"""
     pass
+
+class UMANotFoundError(VoucherError):
+    """Raised when no UMA value applies to the requested date"""
+    def __init__(self, message: str = "No UMA value found", code: int = 404):
+        super().__init__(message, code)
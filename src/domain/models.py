@@ -1,7 +1,10 @@
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
 from typing import Optional
 
+from src.domain.exceptions import LimitExceededError
+
 class UMAValue:
     """Value object representing UMA values"""
     def __init__(self, daily_value: Decimal, valid_from: datetime):
@@ -9,18 +12,76 @@ class UMAValue:
         self.valid_from = valid_from
         self.created_at = datetime.utcnow()
 
+    @property
+    def limits(self) -> 'VoucherLimits':
+        """Voucher limits for this UMA period"""
+        return VoucherLimits(self.daily_value)
+
+class LimitsSnapshot:
+    """UMA, limits and annual usage a voucher is checked against, loaded once per request.
+
+    The monthly cap comes from the UMA in effect on the transaction date;
+    the annual cap from annual_limits, the limits the whole year is held to.
+    """
+    def __init__(self, uma: UMAValue, year: int, used: Decimal,
+                 annual_limits: Optional['VoucherLimits'] = None):
+        self.uma = uma
+        self.limits = uma.limits
+        self.annual_limits = annual_limits or self.limits
+        self.year = year
+        self.used = used
+        self.remaining = self.annual_limits.max_annual_amount - used
+
+    def check(self, amount: Decimal) -> None:
+        """Raise LimitExceededError if amount breaks the monthly or remaining annual limit"""
+        if amount > self.limits.monthly_uma:
+            raise LimitExceededError(
+                f"Amount exceeds monthly UMA limit of {self.limits.monthly_uma:.2f} MXN"
+            )
+        if amount > self.remaining:
+            raise LimitExceededError(
+                f"Amount would exceed annual UMA limit of {self.annual_limits.max_annual_amount:.2f} MXN"
+            )
+
 class VoucherTransaction:
     """Value object representing voucher transactions"""
-    def __init__(self, amount: Decimal, transaction_date: datetime):
+    def __init__(self, amount: Decimal, transaction_date: datetime, employee_id: str = ''):
         self.amount = amount
         self.transaction_date = transaction_date
+        self.employee_id = employee_id
         self.created_at = datetime.utcnow()
 
 class VoucherLimits:
-    """Value object for voucher limits calculation"""
-    def __init__(self, daily_uma: Decimal):
-        self.daily_uma = daily_uma
-        self.monthly_uma = daily_uma * Decimal('30.4')
-        self.annual_max_deposits = 7
-        self.max_monthly_amount = self.monthly_uma
-        self.max_annual_amount = self.monthly_uma * Decimal(str(self.annual_max_deposits))
+    """Immutable value object for voucher limits, computed once per daily UMA value"""
+    __slots__ = (
+        'daily_uma',
+        'monthly_uma',
+        'annual_max_deposits',
+        'max_monthly_amount',
+        'max_annual_amount'
+    )
+
+    def __new__(cls, daily_uma: Decimal) -> 'VoucherLimits':
+        return _voucher_limits(cls, daily_uma)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), (self.daily_uma,))
+
+@lru_cache(maxsize=256)
+def _voucher_limits(cls, daily_uma: Decimal) -> VoucherLimits:
+    """Build limits for a daily UMA value; memoized since UMA changes once a year"""
+    limits = object.__new__(cls)
+    monthly_uma = daily_uma * Decimal('30.4')
+    annual_max_deposits = 7
+    for name, value in (
+        ('daily_uma', daily_uma),
+        ('monthly_uma', monthly_uma),
+        ('annual_max_deposits', annual_max_deposits),
+        ('max_monthly_amount', monthly_uma),
+        ('max_annual_amount', monthly_uma * Decimal(str(annual_max_deposits))),
+    ):
+        object.__setattr__(limits, name, value)
+    return limits
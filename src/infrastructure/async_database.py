@@ -0,0 +1,38 @@
+# Async database access for the ASGI entry point
+import os
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite'
+}
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def create_engine_from_env() -> AsyncEngine:
+    """Create the async engine and connection pool from the environment"""
+    url = os.environ.get('ASYNC_DATABASE_URL') or async_database_url(os.environ['DATABASE_URL'])
+    options = {'pool_recycle': 300, 'pool_pre_ping': True}
+    if url.startswith('postgresql') and os.environ.get('DB_PGBOUNCER', '').lower() in ('1', 'true', 'yes', 'on'):
+        # asyncpg prepares every statement; pgbouncer's transaction pooling
+        # cannot route prepared statements back to the connection that owns them
+        options.update({
+            'poolclass': NullPool,
+            'pool_pre_ping': False,
+            'connect_args': {'statement_cache_size': 0, 'prepared_statement_cache_size': 0}
+        })
+    elif not url.startswith('sqlite'):
+        options.update({
+            'pool_size': int(os.environ.get('ASYNC_DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('ASYNC_DB_MAX_OVERFLOW', 20))
+        })
+    return create_async_engine(url, **options)
@@ -0,0 +1,228 @@
+# Idempotency-Key support: replay stored responses to retried POSTs
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from flask import Flask, Response, g, jsonify, request
+
+from src.infrastructure.database import db, upsert
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Seconds a claimed key blocks duplicates before its response is stored; a
+# worker that dies mid-request frees the key after this long
+PENDING_TTL = 60
+
+# View names registered with @idempotent, in any blueprint
+IDEMPOTENT_VIEWS = set()
+
+class IdempotentResponse(NamedTuple):
+    """A claimed key: the request body hash, plus the response once there is one"""
+    fingerprint: str
+    status_code: Optional[int] = None
+    body: bytes = b''
+    content_type: str = ''
+
+class MemoryIdempotencyStore:
+    """Per-process store with a TTL per key and least-recently-used eviction"""
+
+    def __init__(self, ttl: float, maxsize: int = 10000, pending_ttl: float = PENDING_TTL):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.pending_ttl = pending_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, fingerprint: str) -> Optional[IdempotentResponse]:
+        """Claim key for a new request, or return what is already stored under it"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            self._entries[key] = (now + self.pending_ttl, IdempotentResponse(fingerprint))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return None
+
+    def complete(self, key: str, response: IdempotentResponse) -> None:
+        """Store the response for a claimed key until the TTL elapses"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+
+    def release(self, key: str) -> None:
+        """Forget a claim so the request can be retried"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+class IdempotencyKeyModel(db.Model):
+    """Database model for idempotency keys shared between replicas"""
+    __tablename__ = 'idempotency_keys'
+
+    key = db.Column(db.String(MAX_KEY_LENGTH + 64), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    body = db.Column(db.LargeBinary)
+    content_type = db.Column(db.String(100))
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+class DatabaseIdempotencyStore:
+    """Store backed by the idempotency_keys table, so every replica sees every key.
+
+    Claims are an INSERT ... ON CONFLICT DO NOTHING, so two replicas racing
+    on the same key cannot both run the request.
+    """
+    # Seconds between sweeps of expired keys from one process
+    PURGE_INTERVAL = 60
+
+    def __init__(self, ttl: float, pending_ttl: float = PENDING_TTL):
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self._purged_at = 0.0
+
+    def claim(self, key: str, fingerprint: str) -> Optional[IdempotentResponse]:
+        """Claim key for a new request, or return what is already stored under it"""
+        table = IdempotencyKeyModel.__table__
+        now = datetime.utcnow()
+        # Its own transaction, so the claim is visible before the view runs
+        with db.engine.begin() as connection:
+            self._purge(connection, now)
+            connection.execute(table.delete().where(table.c.key == key, table.c.expires_at <= now))
+            claimed = connection.execute(
+                upsert(table).values(
+                    key=key, fingerprint=fingerprint, expires_at=now + timedelta(seconds=self.pending_ttl)
+                ).on_conflict_do_nothing(index_elements=[table.c.key])
+            ).rowcount
+            if claimed:
+                return None
+            row = connection.execute(table.select().where(table.c.key == key)).first()
+        if row is None:
+            # Released between the insert and the read; go ahead as a new request
+            return None
+        return IdempotentResponse(row.fingerprint, row.status_code, row.body or b'', row.content_type or '')
+
+    def complete(self, key: str, response: IdempotentResponse) -> None:
+        """Store the response for a claimed key until the TTL elapses"""
+        table = IdempotencyKeyModel.__table__
+        values = {
+            'fingerprint': response.fingerprint,
+            'status_code': response.status_code,
+            'body': response.body,
+            'content_type': response.content_type,
+            'expires_at': datetime.utcnow() + timedelta(seconds=self.ttl)
+        }
+        stmt = upsert(table).values(key=key, **values)
+        with db.engine.begin() as connection:
+            connection.execute(stmt.on_conflict_do_update(index_elements=[table.c.key], set_=values))
+
+    def release(self, key: str) -> None:
+        """Forget a claim so the request can be retried"""
+        table = IdempotencyKeyModel.__table__
+        with db.engine.begin() as connection:
+            connection.execute(table.delete().where(table.c.key == key))
+
+    def _purge(self, connection, now: datetime) -> None:
+        if time.monotonic() - self._purged_at < self.PURGE_INTERVAL:
+            return
+        self._purged_at = time.monotonic()
+        table = IdempotencyKeyModel.__table__
+        connection.execute(table.delete().where(table.c.expires_at <= now))
+
+def store_from_env():
+    """Build the store selected by IDEMPOTENCY_STORE (memory or database)"""
+    ttl = float(os.environ.get('IDEMPOTENCY_TTL', 86400))
+    kind = os.environ.get('IDEMPOTENCY_STORE', 'memory').lower()
+    if kind == 'database':
+        return DatabaseIdempotencyStore(ttl)
+    if kind != 'memory':
+        raise ValueError(f"IDEMPOTENCY_STORE must be memory or database, not {kind!r}")
+    return MemoryIdempotencyStore(ttl, int(os.environ.get('IDEMPOTENCY_MAX_KEYS', 10000)))
+
+def idempotent(view):
+    """Honour the Idempotency-Key header on this POST route"""
+    IDEMPOTENT_VIEWS.add(view.__name__)
+    return view
+
+def _error(message: str, status_code: int) -> Response:
+    response = jsonify({'error': message})
+    response.status_code = status_code
+    return response
+
+def install_idempotency(app: Flask, store=None) -> None:
+    """Replay the stored response when an @idempotent route sees an Idempotency-Key again.
+
+    Hooks are keyed on the endpoint, so they also cover views swapped in by
+    install_fast_paths. Keys are scoped to the endpoint, and reusing one
+    with a different body is refused. 5xx responses are not stored, so the
+    client can retry them.
+    """
+    store = store or store_from_env()
+    app.extensions['idempotency'] = store
+
+    @app.before_request
+    def replay_response():
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or request.method != 'POST' or not request.endpoint:
+            return None
+        if request.endpoint.rpartition('.')[2] not in IDEMPOTENT_VIEWS:
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters", 400)
+
+        scoped_key = f"{request.endpoint}:{key}"
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        stored = store.claim(scoped_key, fingerprint)
+        if stored is None:
+            g.idempotency_key = (scoped_key, fingerprint)
+            return None
+        if stored.fingerprint != fingerprint:
+            return _error(f"{IDEMPOTENCY_HEADER} was already used with a different request", 422)
+        if stored.status_code is None:
+            response = _error(f"A request with this {IDEMPOTENCY_HEADER} is still in progress", 409)
+            response.headers['Retry-After'] = '1'
+            return response
+        return Response(
+            stored.body,
+            status=stored.status_code,
+            content_type=stored.content_type,
+            headers={'Idempotent-Replayed': 'true'}
+        )
+
+    @app.after_request
+    def store_response(response):
+        claim = g.pop('idempotency_key', None)
+        if claim is None:
+            return response
+        scoped_key, fingerprint = claim
+        try:
+            if response.status_code >= 500 or response.is_streamed:
+                store.release(scoped_key)
+            else:
+                store.complete(scoped_key, IdempotentResponse(
+                    fingerprint, response.status_code, response.get_data(), response.content_type
+                ))
+        except Exception as e:
+            # The request itself succeeded; failing it now would invite the retry we guard against
+            logger.error(f"Could not store idempotent response for {scoped_key}: {str(e)}")
+        return response
+
+    @app.teardown_request
+    def release_claim(exc):
+        # after_request is skipped when a request fails outright
+        claim = g.pop('idempotency_key', None)
+        if claim is not None:
+            try:
+                store.release(claim[0])
+            except Exception as e:
+                logger.error(f"Could not release {claim[0]}: {str(e)}")
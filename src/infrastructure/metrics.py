@@ -0,0 +1,219 @@
+# Prometheus-style metrics collectors
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds in seconds; the implicit +Inf bucket catches the rest
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric(ABC):
+    """Base class for metrics: a name, help text and the samples to render"""
+    type = ''
+
+    def __init__(self, name: str, documentation: str, registry: 'Registry' = None):
+        self.name = name
+        self.documentation = documentation
+        (registry or REGISTRY).register(self)
+
+    @abstractmethod
+    def _samples(self) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        """(suffix, labels, value) for each line of the exposition"""
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+class _LabelledMetric(_Metric):
+    """Base class for labelled metrics; children are created once per label set"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: 'Registry' = None):
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        super().__init__(name, documentation, registry)
+
+    def labels(self, *values: str):
+        """Return the child for a label set, creating it on first use"""
+        # A plain dict read is atomic, so the lock is only taken for new label sets
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child holding one label set's value"""
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+class Counter(_LabelledMetric):
+    """Monotonic counter"""
+    type = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for values, child in list(self._children.items()):
+            yield '_total', dict(zip(self.labelnames, values)), child.value
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        # Find the bucket outside the lock; the critical section is two adds
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+class Histogram(_LabelledMetric):
+    """Cumulative histogram with fixed bucket bounds"""
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: 'Registry' = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self):
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield '_bucket', {**labels, 'le': _format_value(float(bound))}, cumulative
+            yield '_sum', labels, total
+            yield '_count', labels, cumulative
+
+class CallbackMetric(_Metric):
+    """Metric whose samples are read from a callback at scrape time"""
+
+    def __init__(self, name: str, documentation: str, type: str,
+                 callback: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+                 registry: 'Registry' = None):
+        self.type = type
+        self.callback = callback
+        super().__init__(name, documentation, registry=registry)
+
+    def _samples(self):
+        suffix = '_total' if self.type == 'counter' else ''
+        for labels, value in self.callback():
+            yield suffix, labels, value
+
+class Registry:
+    """Collection of metrics rendered together in the text exposition format"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = Registry()
+
+http_request_duration = Histogram(
+    'http_request_duration_seconds',
+    'Request latency by route',
+    ['route', 'method', 'status']
+)
+db_query_duration = Histogram(
+    'db_query_duration_seconds',
+    'SQL statement latency by the repository method that issued it',
+    ['repository_method']
+)
+inegi_fetch_duration = Histogram(
+    'inegi_fetch_duration_seconds',
+    'INEGI series fetch latency by outcome',
+    ['outcome'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+_repository_method: ContextVar[str] = ContextVar('repository_method', default='other')
+
+def repository_method(func):
+    """Attribute the SQL statements issued inside func to it"""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _repository_method.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _repository_method.reset(token)
+    return wrapper
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement run on engine"""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_started', None)
+        if started is not None:
+            db_query_duration.labels(_repository_method.get()).observe(time.perf_counter() - started)
@@ -0,0 +1,133 @@
+# Connection pool configuration and instrumentation
+import os
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool, QueuePool
+
+# How connections are checked before use: on every checkout, only after they
+# have sat idle for DB_PRE_PING_IDLE seconds, or never
+PRE_PING_STRATEGIES = ('always', 'idle', 'never')
+DEFAULT_PRE_PING = 'always'
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+class PoolWaitStats:
+    """Counts pool checkouts and how long they waited for a connection"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'wait_seconds_total': self.wait_seconds_total,
+                'wait_seconds_max': self.wait_seconds_max
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_stats.observe(time.perf_counter() - started)
+
+def engine_options_from_env(url: str) -> dict:
+    """Build SQLAlchemy engine options from the DB_* environment variables"""
+    strategy = os.environ.get('DB_PRE_PING', DEFAULT_PRE_PING)
+    if strategy not in PRE_PING_STRATEGIES:
+        raise ValueError(f"DB_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}")
+
+    options = {
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 300)),
+        'pool_pre_ping': strategy == 'always'
+    }
+    # SQLite keeps the driver's default pools
+    if make_url(url).get_backend_name() != 'postgresql':
+        return options
+
+    if _flag('DB_PGBOUNCER'):
+        # pgbouncer already pools and health-checks server connections, and
+        # rejects unknown startup parameters such as -c statement_timeout
+        options.update({'poolclass': NullPool, 'pool_pre_ping': False})
+        return options
+
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30))
+    })
+    timeout = os.environ.get('DB_STATEMENT_TIMEOUT_MS')
+    if timeout:
+        options['connect_args'] = {'options': f"-c statement_timeout={int(timeout)}"}
+    return options
+
+def configure_engine(engine: Engine) -> None:
+    """Install the pool event hooks selected by the DB_* environment variables"""
+    if os.environ.get('DB_PRE_PING', DEFAULT_PRE_PING) == 'idle' and not _flag('DB_PGBOUNCER'):
+        idle_seconds = float(os.environ.get('DB_PRE_PING_IDLE', 30))
+
+        @event.listens_for(engine, 'checkin')
+        def record_checkin(dbapi_connection, connection_record):
+            connection_record.info['checked_in_at'] = time.monotonic()
+
+        @event.listens_for(engine, 'checkout')
+        def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+            checked_in_at = connection_record.info.get('checked_in_at')
+            if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+                return
+            try:
+                cursor = dbapi_connection.cursor()
+                cursor.execute('SELECT 1')
+                cursor.close()
+            except Exception as e:
+                # The pool discards this connection and retries with a new one
+                raise exc.DisconnectionError() from e
+
+    timeout = os.environ.get('DB_STATEMENT_TIMEOUT_MS')
+    if timeout and _flag('DB_PGBOUNCER') and engine.dialect.name == 'postgresql':
+        statement = f"SET LOCAL statement_timeout = {int(timeout)}"
+
+        # Transaction pooling hands out a different server connection per
+        # transaction, so the timeout has to be set inside each one
+        @event.listens_for(engine, 'begin')
+        def set_statement_timeout(connection):
+            connection.exec_driver_sql(statement)
+
+def pool_stats(engine: Engine) -> Dict[str, float]:
+    """Report pool usage and checkout wait time for one worker"""
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__, 'pid': os.getpid()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': pool.overflow()
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.wait_stats.snapshot())
+    return stats
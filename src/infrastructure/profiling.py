@@ -0,0 +1,111 @@
+# Opt-in per-request profiling
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import tempfile
+import time
+from typing import List, Optional
+
+from flask import Flask, g, request
+
+PROFILE_HEADER = 'X-Profile'
+
+def profile_dir() -> str:
+    """Directory holding the profile ring buffer"""
+    return os.environ.get('PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'uma-calculator-profiles')
+
+class ProfileRing:
+    """Bounded on-disk buffer of cProfile dumps; the oldest files are dropped first"""
+
+    def __init__(self, directory: str, max_files: int = 100):
+        self.directory = directory
+        self.max_files = max_files
+
+    def files(self, endpoint: Optional[str] = None) -> List[str]:
+        """Return stored profiles, oldest first, optionally for one endpoint"""
+        try:
+            names = sorted(name for name in os.listdir(self.directory) if name.endswith('.prof'))
+        except FileNotFoundError:
+            return []
+        if endpoint:
+            names = [name for name in names if name.split('-', 2)[2][:-len('.prof')] == endpoint]
+        return [os.path.join(self.directory, name) for name in names]
+
+    def write(self, profile: cProfile.Profile, endpoint: str) -> str:
+        """Dump a profile and trim the buffer; returns the file name"""
+        os.makedirs(self.directory, exist_ok=True)
+        # Zero-padded nanoseconds sort by age; the pid keeps workers apart
+        name = f"{time.time_ns():020d}-{os.getpid()}-{re.sub(r'[^A-Za-z0-9_.]', '_', endpoint)}.prof"
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.tmp"
+        profile.dump_stats(tmp_path)
+        os.replace(tmp_path, path)
+
+        for stale in self.files()[:-self.max_files]:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                # Another worker trimmed it first
+                pass
+        return name
+
+    def top(self, limit: int = 20, sort: str = 'cumulative', endpoint: Optional[str] = None) -> str:
+        """Merge stored profiles and render the top functions"""
+        files = self.files(endpoint)
+        if not files:
+            return ''
+        stream = io.StringIO()
+        stats = pstats.Stats(*files, stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+def install_profiling(app: Flask) -> None:
+    """Profile requests that send PROFILE_TOKEN in X-Profile or fall in the PROFILE_SAMPLE_RATE sample.
+
+    Nothing is registered unless one of them is set, so the mode costs
+    nothing when it is off.
+    """
+    token = os.environ.get('PROFILE_TOKEN')
+    sample_rate = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    if not token and sample_rate <= 0:
+        return
+
+    ring = ProfileRing(profile_dir(), int(os.environ.get('PROFILE_MAX_FILES', 100)))
+
+    def wanted() -> bool:
+        header = request.headers.get(PROFILE_HEADER)
+        if token and header and hmac.compare_digest(header, token):
+            return True
+        return sample_rate > 0 and random.random() < sample_rate
+
+    @app.before_request
+    def start_profile():
+        if not wanted():
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return
+        g.profile = profile
+
+    @app.after_request
+    def save_profile(response):
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile.disable()
+            name = ring.write(profile, request.endpoint or 'unmatched')
+            response.headers['X-Profile-Id'] = name
+        return response
+
+    @app.teardown_request
+    def stop_profile(exc):
+        # after_request is skipped when a request fails outright
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile.disable()
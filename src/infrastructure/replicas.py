@@ -0,0 +1,193 @@
+# Read-replica routing for the Flask-SQLAlchemy session
+import functools
+import logging
+import os
+import random
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.engine import Engine, make_url
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Seconds the replica is behind: zero on a primary or a streaming replica
+# that has replayed everything it received, infinite when no WAL receiver is
+# streaming (equal LSNs then only mean nothing new has arrived), otherwise
+# the age of the last replayed transaction. Roles without pg_read_all_stats
+# see a NULL status, so for them a running receiver counts as streaming.
+LAG_SQL = text(
+    'SELECT CASE '
+    'WHEN NOT pg_is_in_recovery() THEN 0 '
+    'WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver '
+    "WHERE coalesce(status, 'streaming') = 'streaming') THEN 'Infinity'::float8 "
+    'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8 END'
+)
+
+_replica_reads: ContextVar[bool] = ContextVar('replica_reads', default=False)
+
+def replica_binds_from_env(engine_options) -> Dict[str, dict]:
+    """SQLALCHEMY_BINDS entries for the comma-separated DATABASE_REPLICA_URLS"""
+    urls = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    binds = {}
+    for i, url in enumerate(urls):
+        options = engine_options(url)
+        if make_url(url).get_backend_name() == 'postgresql':
+            # An unreachable replica fails fast instead of holding a lag check
+            # or a request for the whole TCP connect timeout
+            options['connect_args'] = {
+                **options.get('connect_args', {}),
+                'connect_timeout': int(os.environ.get('DB_REPLICA_CONNECT_TIMEOUT', 2))
+            }
+        binds[f"{REPLICA_BIND_PREFIX}{i}"] = {'url': url, **options}
+    return binds
+
+@contextmanager
+def replica_reads():
+    """Let SELECTs run in this block go to a replica"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+def replica_read(func):
+    """Run func's SELECTs on a replica when one is configured and caught up"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return func(*args, **kwargs)
+    return wrapper
+
+class ReplicaRouter:
+    """Picks a replica whose replication lag is within max_lag.
+
+    Lag is measured by a background thread every check_interval, so
+    requests only read the last measurement and never wait on a slow or
+    unreachable replica. A replica that has not been measured yet, or
+    cannot be reached, counts as infinitely behind until its next check.
+    """
+
+    def __init__(self, bind_keys: List[str], max_lag: float = 5, check_interval: float = 5):
+        self.bind_keys = bind_keys
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lags: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    @classmethod
+    def from_env(cls, binds: Dict[str, dict]) -> Optional['ReplicaRouter']:
+        """Build a router for the replica binds, if there are any"""
+        if not binds:
+            return None
+        return cls(
+            sorted(binds),
+            max_lag=float(os.environ.get('DB_REPLICA_MAX_LAG', 5)),
+            check_interval=float(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 5))
+        )
+
+    def ensure_started(self, engines) -> None:
+        """Start measuring lag in this process if it is not running yet"""
+        # Threads don't survive fork, so a preloading server's workers each start their own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            engines = {key: engines[key] for key in self.bind_keys}
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(engines,), name='replica-lag', daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the thread after its current check"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._pid = None
+
+    def _run(self, engines) -> None:
+        while True:
+            self.check(engines)
+            if self._stop.wait(self.check_interval):
+                return
+
+    def check(self, engines) -> None:
+        """Measure every replica's lag now"""
+        for key in self.bind_keys:
+            lag = self.measure(key, engines[key])
+            with self._lock:
+                self._lags[key] = lag
+
+    def measure(self, key: str, engine: Engine) -> float:
+        """Seconds the replica is behind the primary"""
+        if engine.dialect.name != 'postgresql':
+            return 0.0
+        try:
+            with engine.connect() as connection:
+                return float(connection.execute(LAG_SQL).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Replica {key} lag check failed: {str(e)}")
+            return float('inf')
+
+    def lags(self) -> Dict[str, float]:
+        """Last measured lag per replica"""
+        with self._lock:
+            return dict(self._lags)
+
+    def choose(self, engines) -> Optional[Engine]:
+        """A caught-up replica engine, or None to fall back to the primary"""
+        lags = self.lags()
+        healthy = [key for key in self.bind_keys if lags.get(key, float('inf')) <= self.max_lag]
+        if not healthy:
+            return None
+        return engines[random.choice(healthy)]
+
+class RoutingSession(Session):
+    """Session that sends SELECTs inside replica_reads() to a replica.
+
+    Anything else, and every statement after the session's first write,
+    goes to the primary, so a request reads its own writes. The pin lasts
+    until the session is removed at the end of the app context; a client's
+    next request may read a replica that has not replayed its write yet,
+    for up to DB_REPLICA_MAX_LAG seconds.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None:
+            return primary
+        writes = (
+            self._flushing
+            or clause is None
+            or not getattr(clause, 'is_select', False)
+            or getattr(clause, '_for_update_arg', None) is not None
+        )
+        if writes:
+            self.info['pinned'] = True
+            return primary
+        if not _replica_reads.get() or self.info.get('pinned'):
+            return primary
+
+        # Stay on one replica per session so reads never go back in time
+        replica = self.info.get('replica')
+        if replica is None:
+            router = current_app.extensions.get('replicas')
+            replica = router.choose(self._db.engines) if router else None
+            if replica is None:
+                return primary
+            self.info['replica'] = replica
+        return replica
@@ -0,0 +1,77 @@
+# Async repository implementations for the ASGI entry point
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.domain.models import UMAValue
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.repositories.transaction_repository import AnnualTotalModel
+from src.infrastructure.repositories.uma_repository import (
+    UMAIntervalIndex,
+    UMAValueModel,
+    uma_cache
+)
+
+class AsyncUMARepository:
+    """Loads the UMA interval index without blocking the event loop"""
+
+    def __init__(self, engine: AsyncEngine, cache: Optional[TTLCache] = None):
+        self.engine = engine
+        self.cache = cache or uma_cache
+
+    async def get_index(self) -> UMAIntervalIndex:
+        """Get the cached interval index, loading it on a miss"""
+        found, index = self.cache.get(UMAIntervalIndex)
+        if found:
+            return index
+
+        stmt = select(UMAValueModel.daily_value, UMAValueModel.valid_from)
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(stmt)).all()
+        index = UMAIntervalIndex([
+            UMAValue(daily_value=daily_value, valid_from=valid_from)
+            for daily_value, valid_from in rows
+        ])
+        if index.values:
+            self.cache.set(UMAIntervalIndex, index)
+        return index
+
+class AsyncTransactionRepository:
+    """Reads running annual totals without blocking the event loop"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    async def get_annual_total(self, year: int, employee_id: str = '') -> Decimal:
+        """Get total vouchers issued to an employee for a specific year"""
+        stmt = select(AnnualTotalModel.total).where(
+            AnnualTotalModel.employee_id == employee_id,
+            AnnualTotalModel.year == year
+        )
+        async with self.engine.connect() as conn:
+            total = (await conn.execute(stmt)).scalar()
+        return total or Decimal('0')
+
+class PreloadedUMARepository:
+    """Sync UMA repository over an already loaded index, for VoucherService"""
+
+    def __init__(self, index: UMAIntervalIndex):
+        self.index = index
+
+    def get_current_value(self) -> Optional[UMAValue]:
+        return self.index.values[-1] if self.index.values else None
+
+    def get_value_at(self, on: date) -> Optional[UMAValue]:
+        return self.index.lookup(on)
+
+class PreloadedTransactionRepository:
+    """Sync transaction repository over already loaded totals, for VoucherService"""
+
+    def __init__(self, totals: Dict[Tuple[int, str], Decimal]):
+        self.totals = totals
+
+    def get_annual_total(self, year: int, employee_id: str = '') -> Decimal:
+        return self.totals[(year, employee_id)]
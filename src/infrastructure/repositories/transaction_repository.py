@@ -1,33 +1,270 @@
-from datetime import datetime
+import csv
+import io
+from datetime import date, datetime
 from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from src.domain.models import VoucherTransaction
-from src.infrastructure.database import db
+from src.infrastructure.database import db, upsert
+from src.infrastructure.metrics import repository_method
+from src.infrastructure.replicas import replica_read
 
 class TransactionModel(db.Model):
     """Database model for voucher transactions"""
     __tablename__ = 'voucher_transactions'
+    __table_args__ = (
+        # Covers the annual total range scan; INCLUDE lets Postgres answer
+        # the SUM from the index alone
+        db.Index(
+            'ix_voucher_transactions_transaction_date',
+            'transaction_date',
+            postgresql_include=['amount']
+        ),
+        db.Index(
+            'ix_voucher_transactions_employee_date',
+            'employee_id',
+            'transaction_date',
+            postgresql_include=['amount']
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
+    # Empty string is the shared ledger for vouchers issued without an employee
+    employee_id = db.Column(db.String(64), nullable=False, default='', server_default='')
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     transaction_date = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class AnnualTotalModel(db.Model):
+    """Database model for running annual voucher totals per employee"""
+    __tablename__ = 'voucher_annual_totals'
+
+    employee_id = db.Column(db.String(64), primary_key=True, default='')
+    year = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class TransactionRepository:
-    def get_annual_total(self, year: int) -> Decimal:
-        """Get total vouchers issued for a specific year"""
+    @repository_method
+    @replica_read
+    def get_annual_total(self, year: int, employee_id: str = '') -> Decimal:
+        """Get total vouchers issued to an employee for a specific year"""
+        total = db.session.query(AnnualTotalModel.total).filter(
+            AnnualTotalModel.employee_id == employee_id,
+            AnnualTotalModel.year == year
+        ).scalar()
+        return total or Decimal('0')
+
+    @repository_method
+    @replica_read
+    def get_annual_totals(self, year: int, employee_ids: Iterable[str]) -> Dict[str, Decimal]:
+        """Get totals for many employees in one query, defaulting to zero"""
+        employee_ids = set(employee_ids)
+        totals = dict.fromkeys(employee_ids, Decimal('0'))
+        totals.update(db.session.query(
+            AnnualTotalModel.employee_id, AnnualTotalModel.total
+        ).filter(
+            AnnualTotalModel.year == year,
+            AnnualTotalModel.employee_id.in_(employee_ids)
+        ))
+        return totals
+
+    @repository_method
+    @replica_read
+    def get_ledger_total(self, year: int, employee_id: str = '') -> Decimal:
+        """Sum an employee's raw ledger for a specific year"""
+        # Half-open date range instead of extract('year') so the index is usable
         total = db.session.query(
             db.func.sum(TransactionModel.amount)
         ).filter(
-            db.extract('year', TransactionModel.transaction_date) == year
+            TransactionModel.employee_id == employee_id,
+            TransactionModel.transaction_date >= date(year, 1, 1),
+            TransactionModel.transaction_date < date(year + 1, 1, 1)
         ).scalar()
         return total or Decimal('0')
 
+    @repository_method
+    @replica_read
+    def iter_year(self, year: int, batch_size: int = 1000):
+        """Stream a year's ledger as (employee_id, transaction_date, amount) rows.
+
+        Ordered by employee then date, and fetched batch_size rows at a time
+        through a server-side cursor on Postgres, so memory stays flat however
+        large the ledger is.
+        """
+        return db.session.execute(
+            db.select(
+                TransactionModel.employee_id, TransactionModel.transaction_date, TransactionModel.amount
+            ).filter(
+                TransactionModel.transaction_date >= date(year, 1, 1),
+                TransactionModel.transaction_date < date(year + 1, 1, 1)
+            ).order_by(
+                TransactionModel.employee_id, TransactionModel.transaction_date, TransactionModel.id
+            ).execution_options(yield_per=batch_size)
+        )
+
+    @repository_method
     def save(self, transaction: VoucherTransaction) -> None:
-        """Save new transaction"""
+        """Save new transaction and update its annual total atomically"""
         record = TransactionModel(
             amount=transaction.amount,
-            transaction_date=transaction.transaction_date
+            transaction_date=transaction.transaction_date,
+            employee_id=transaction.employee_id
         )
         db.session.add(record)
+        self._add_to_annual_total(
+            transaction.employee_id, transaction.transaction_date.year, transaction.amount
+        )
+        db.session.commit()
+
+    @repository_method
+    def reserve(self, transaction: VoucherTransaction, limit: Decimal) -> Optional[Decimal]:
+        """Save transaction only if the employee's year total stays within limit.
+
+        Returns the new annual total, or None if the limit would be exceeded.
+        The conditional update locks the year's total row, so concurrent
+        reservations are serialized and cannot overshoot the limit together.
+        """
+        employee_id = transaction.employee_id
+        year = transaction.transaction_date.year
+        table = AnnualTotalModel.__table__
+        now = datetime.utcnow()
+
+        # Make sure the row exists so the conditional update has something to lock
+        db.session.execute(
+            upsert(table).values(employee_id=employee_id, year=year, total=0, updated_at=now)
+            .on_conflict_do_nothing(index_elements=[table.c.employee_id, table.c.year])
+        )
+        total = db.session.execute(
+            table.update()
+            .where(
+                table.c.employee_id == employee_id,
+                table.c.year == year,
+                table.c.total + transaction.amount <= limit
+            )
+            .values(total=table.c.total + transaction.amount, updated_at=now)
+            .returning(table.c.total)
+        ).scalar()
+
+        if total is None:
+            db.session.rollback()
+            return None
+
+        db.session.add(TransactionModel(
+            amount=transaction.amount,
+            transaction_date=transaction.transaction_date,
+            employee_id=employee_id
+        ))
+        db.session.commit()
+        return total
+
+    @repository_method
+    def bulk_insert(self, rows: List[Dict]) -> int:
+        """Insert a chunk of validated rows and their annual totals in one transaction.
+
+        Uses COPY on Postgres and a multi-row INSERT elsewhere.
+        """
+        now = datetime.utcnow()
+        if db.engine.dialect.name == 'postgresql':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow((
+                    row['employee_id'], row['amount'], row['transaction_date'].isoformat(), now.isoformat()
+                ))
+            buffer.seek(0)
+            cursor = db.session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    'COPY voucher_transactions (employee_id, amount, transaction_date, created_at) '
+                    'FROM STDIN WITH (FORMAT csv)',
+                    buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            db.session.execute(
+                TransactionModel.__table__.insert(),
+                [{**row, 'created_at': now} for row in rows]
+            )
+
+        totals = {}
+        for row in rows:
+            key = (row['employee_id'], row['transaction_date'].year)
+            totals[key] = totals.get(key, Decimal('0')) + row['amount']
+        self._add_to_annual_totals(totals, now)
+        db.session.commit()
+        return len(rows)
+
+    def _add_to_annual_total(self, employee_id: str, year: int, amount: Decimal) -> None:
+        """Increment the running total inside the current transaction"""
+        table = AnnualTotalModel.__table__
+        stmt = upsert(table).values(
+            employee_id=employee_id, year=year, total=amount, updated_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.employee_id, table.c.year],
+            set_={
+                'total': table.c.total + stmt.excluded.total,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.session.execute(stmt)
+
+    def _add_to_annual_totals(self, totals: Dict[Tuple[str, int], Decimal], now: datetime) -> None:
+        """Increment many running totals inside the current transaction"""
+        table = AnnualTotalModel.__table__
+        stmt = upsert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.employee_id, table.c.year],
+            set_={
+                'total': table.c.total + stmt.excluded.total,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        # One cached statement run as executemany, instead of compiling a VALUES list per chunk
+        db.session.execute(stmt, [
+            {'employee_id': employee_id, 'year': year, 'total': amount, 'updated_at': now}
+            for (employee_id, year), amount in totals.items()
+        ])
+
+    @repository_method
+    def reconcile_annual_totals(self, dry_run: bool = False) -> List[Tuple[str, int, Decimal, Decimal]]:
+        """Rebuild annual totals from the ledger, returning (employee_id, year, stored, actual) drift"""
+        if not dry_run and db.engine.dialect.name == 'postgresql':
+            # Block concurrent saves so none land between the scan and the rewrite
+            db.session.execute(db.text(
+                'LOCK TABLE voucher_transactions IN SHARE ROW EXCLUSIVE MODE'
+            ))
+
+        year = db.extract('year', TransactionModel.transaction_date)
+        actual = {
+            (employee_id, int(row_year)): total
+            for employee_id, row_year, total in db.session.query(
+                TransactionModel.employee_id, year, db.func.sum(TransactionModel.amount)
+            ).group_by(TransactionModel.employee_id, year)
+        }
+        stored = {
+            (row.employee_id, row.year): row.total
+            for row in db.session.query(AnnualTotalModel)
+        }
+
+        drift = []
+        for key in sorted(set(actual) | set(stored)):
+            expected = actual.get(key, Decimal('0'))
+            current = stored.get(key, Decimal('0'))
+            if expected != current:
+                drift.append((*key, current, expected))
+
+        if dry_run:
+            db.session.rollback()
+            return drift
+
+        now = datetime.utcnow()
+        db.session.query(AnnualTotalModel).delete()
+        db.session.add_all(
+            AnnualTotalModel(employee_id=employee_id, year=row_year, total=total, updated_at=now)
+            for (employee_id, row_year), total in actual.items()
+        )
         db.session.commit()
+        return drift
@@ -1,9 +1,14 @@
-from datetime import datetime
+import os
+from bisect import bisect_right
+from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from src.domain.models import UMAValue
-from src.infrastructure.database import db
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.database import db, upsert
+from src.infrastructure.metrics import CallbackMetric, repository_method
+from src.infrastructure.replicas import replica_read
 
 class UMAValueModel(db.Model):
     """Database model for UMA values"""
@@ -11,10 +16,14 @@ class UMAValueModel(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     daily_value = db.Column(db.Numeric(10, 2), nullable=False)
-    valid_from = db.Column(db.Date, nullable=False)
+    valid_from = db.Column(db.Date, nullable=False, unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class UMARepository:
+    # Reads that fill the process-wide uma_cache or decide when to drop it
+    # stay on the primary: a lagging replica would pin a stale value there
+    # until UMA_CACHE_TTL, with no later fingerprint change to clear it
+    @repository_method
     def get_current_value(self) -> Optional[UMAValue]:
         """Get current UMA value"""
         record = UMAValueModel.query.order_by(
@@ -28,6 +37,40 @@ class UMARepository:
             )
         return None
 
+    @repository_method
+    @replica_read
+    def get_value_at(self, on: date) -> Optional[UMAValue]:
+        """Get UMA value in effect on a date"""
+        record = UMAValueModel.query.filter(
+            UMAValueModel.valid_from <= on
+        ).order_by(
+            UMAValueModel.valid_from.desc()
+        ).first()
+
+        if record:
+            return UMAValue(
+                daily_value=record.daily_value,
+                valid_from=record.valid_from
+            )
+        return None
+
+    @repository_method
+    def get_all_values(self) -> List[UMAValue]:
+        """Get every UMA value, oldest first"""
+        return [
+            UMAValue(daily_value=record.daily_value, valid_from=record.valid_from)
+            for record in UMAValueModel.query.order_by(UMAValueModel.valid_from)
+        ]
+
+    @repository_method
+    def get_fingerprint(self) -> Tuple[int, Optional[date]]:
+        """Row count and newest valid_from, which change whenever a value is written"""
+        count, newest = db.session.query(
+            db.func.count(UMAValueModel.id), db.func.max(UMAValueModel.valid_from)
+        ).one()
+        return count, newest
+
+    @repository_method
     def save(self, uma_value: UMAValue) -> None:
         """Save new UMA value"""
         record = UMAValueModel(
@@ -36,3 +79,92 @@ class UMARepository:
         )
         db.session.add(record)
         db.session.commit()
+
+    @repository_method
+    def save_many(self, uma_values: List[UMAValue]) -> int:
+        """Insert UMA values in one statement, skipping stored periods; returns rows inserted"""
+        if not uma_values:
+            return 0
+
+        now = datetime.utcnow()
+        table = UMAValueModel.__table__
+        stmt = upsert(table).values([
+            {'daily_value': value.daily_value, 'valid_from': value.valid_from, 'created_at': now}
+            for value in uma_values
+        ]).on_conflict_do_nothing(index_elements=[table.c.valid_from])
+        inserted = db.session.execute(stmt).rowcount
+        db.session.commit()
+        return inserted
+
+class UMAIntervalIndex:
+    """Sorted in-memory index of UMA periods, searched with bisect"""
+
+    def __init__(self, values: List[UMAValue]):
+        self.values = sorted(values, key=lambda value: value.valid_from)
+        self.starts = [value.valid_from for value in self.values]
+
+    def lookup(self, on: date) -> Optional[UMAValue]:
+        """Return the value whose period contains the date"""
+        position = bisect_right(self.starts, on) - 1
+        return self.values[position] if position >= 0 else None
+
+# Shared by every CachedUMARepository in the process so a write through any
+# of them invalidates what the others serve
+uma_cache = TTLCache(ttl=float(os.environ.get('UMA_CACHE_TTL', 3600)))
+
+def _uma_cache_hit_ratio():
+    stats = uma_cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    return [({}, stats['hits'] / lookups if lookups else 0.0)]
+
+CallbackMetric('uma_cache_hits', 'UMA cache lookups served from memory', 'counter',
+               lambda: [({}, uma_cache.stats()['hits'])])
+CallbackMetric('uma_cache_misses', 'UMA cache lookups that went to the database', 'counter',
+               lambda: [({}, uma_cache.stats()['misses'])])
+CallbackMetric('uma_cache_hit_ratio', 'Share of UMA cache lookups served from memory', 'gauge',
+               _uma_cache_hit_ratio)
+
+class CachedUMARepository(UMARepository):
+    """UMA repository that serves reads from an in-process TTL cache"""
+
+    def __init__(self, cache: Optional[TTLCache] = None):
+        self.cache = cache or uma_cache
+
+    def get_current_value(self) -> Optional[UMAValue]:
+        """Get current UMA value, keyed on today's effective date"""
+        key = date.today()
+        found, value = self.cache.get(key)
+        if found:
+            return value
+
+        value = super().get_current_value()
+        # Don't cache a missing value so the first write is picked up at once
+        if value is not None:
+            self.cache.set(key, value)
+        return value
+
+    def get_value_at(self, on: date) -> Optional[UMAValue]:
+        """Get UMA value in effect on a date from the in-memory interval index"""
+        if isinstance(on, datetime):
+            on = on.date()
+
+        found, index = self.cache.get(UMAIntervalIndex)
+        if not found:
+            index = UMAIntervalIndex(self.get_all_values())
+            if index.values:
+                self.cache.set(UMAIntervalIndex, index)
+        return index.lookup(on)
+
+    def save(self, uma_value: UMAValue) -> None:
+        """Save new UMA value and invalidate cached reads"""
+        try:
+            super().save(uma_value)
+        finally:
+            self.cache.invalidate()
+
+    def save_many(self, uma_values: List[UMAValue]) -> int:
+        """Insert UMA values in bulk and invalidate cached reads"""
+        try:
+            return super().save_many(uma_values)
+        finally:
+            self.cache.invalidate()
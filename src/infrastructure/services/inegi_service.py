@@ -1,10 +1,15 @@
+import hashlib
+import json
 import logging
 import requests
+import time
 from datetime import datetime
-from typing import Optional, Tuple
+from decimal import Decimal
+from typing import List, Optional, Tuple
 import os
 
 from src.domain.models import UMAValue
+from src.infrastructure.metrics import inegi_fetch_duration
 from src.infrastructure.repositories.uma_repository import UMARepository
 
 logger = logging.getLogger(__name__)
@@ -13,7 +18,7 @@ class INEGIService:
     BASE_URL = "https://www.inegi.org.mx/app/api/indicadores/desarrolladores/jsonxml"
     UMA_INDICATOR = "628194"
 
-    def __init__(self, uma_repository: UMARepository):
+    def __init__(self, uma_repository: UMARepository, cache_path: Optional[str] = None):
         self.api_key = os.environ.get('INEGI_API_KEY')
         if not self.api_key:
             raise ValueError("INEGI API key not found in environment variables")
@@ -23,6 +28,39 @@ class INEGIService:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0'
         })
+        
+        # On-disk cache of the last response, used to skip unchanged series
+        self.cache_path = cache_path or os.environ.get('INEGI_CACHE_PATH')
+        self.not_modified = False
+        self._pending_cache = None
+
+    def _load_cache(self) -> dict:
+        """Read the cached response validators and payload hash"""
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable INEGI cache {self.cache_path}: {str(e)}")
+            return {}
+
+    def _store_cache(self) -> None:
+        """Persist the last fetched response once it has been applied"""
+        if not self.cache_path or self._pending_cache is None:
+            return
+        try:
+            # Write then rename so a crash never leaves a truncated cache
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._pending_cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write INEGI cache {self.cache_path}: {str(e)}")
+        finally:
+            self._pending_cache = None
 
     def _format_date(self, date_str: str) -> datetime:
         """Convert date format to datetime"""
@@ -35,55 +73,141 @@ class INEGIService:
             logger.error(f"Error parsing date {date_str}: {str(e)}")
             raise
 
-    def _get_latest_value(self) -> Optional[Tuple[float, datetime]]:
-        """Fetch the latest UMA value from INEGI's API"""
+    def _fetch_observations(self, conditional: bool = False) -> Optional[List[dict]]:
+        """Fetch the full UMA observation series from INEGI's API.
+
+        When conditional, the cached validators are sent and an unchanged
+        series (304, or an identical payload hash) returns None with
+        not_modified set, before any parsing.
+        """
+        self.not_modified = False
+        started = time.perf_counter()
+        outcome = 'error'
         try:
             params = {'type': 'json'}
             url = f"{self.BASE_URL}/INDICATOR/{self.UMA_INDICATOR}/es/0/false/BIE/2.0/{self.api_key}"
             
-            response = self.session.get(url, params=params, timeout=10)
+            cache = self._load_cache() if conditional else {}
+            headers = {}
+            if cache.get('etag'):
+                headers['If-None-Match'] = cache['etag']
+            if cache.get('last_modified'):
+                headers['If-Modified-Since'] = cache['last_modified']
+            
+            response = self.session.get(url, params=params, headers=headers, timeout=10)
+            if response.status_code == 304:
+                logger.info("UMA series not modified since last fetch")
+                self.not_modified = True
+                outcome = 'not_modified'
+                return None
             response.raise_for_status()
             
+            if self.cache_path:
+                digest = hashlib.sha256(response.content).hexdigest()
+                self._pending_cache = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'sha256': digest,
+                    'fetched_at': datetime.utcnow().isoformat(),
+                    'body': response.text
+                }
+                if conditional and cache.get('sha256') == digest:
+                    logger.info("UMA series payload unchanged since last fetch")
+                    self.not_modified = True
+                    self._store_cache()
+                    outcome = 'unchanged'
+                    return None
+            
             data = response.json()
             series = data.get('Series', [{}])[0]
             
             if not series:
                 logger.error("No series data found in API response")
+                outcome = 'empty'
                 return None
             
             observations = series.get('OBSERVATIONS', [])
             if not observations:
                 logger.error("No observations found in series data")
+                outcome = 'empty'
                 return None
             
-            latest = sorted(observations, key=lambda x: x.get('TIME_PERIOD', ''), reverse=True)[0]
+            outcome = 'ok'
+            return observations
             
-            value = float(latest.get('OBS_VALUE', 0))
-            date_str = latest.get('TIME_PERIOD', '')
+        except Exception as e:
+            logger.error(f"Error fetching UMA value: {str(e)}")
+            return None
+        finally:
+            inegi_fetch_duration.labels(outcome).observe(time.perf_counter() - started)
+
+    def _parse_observation(self, observation: dict) -> Optional[Tuple[float, datetime]]:
+        """Parse one observation into (value, valid_from)"""
+        try:
+            value = float(observation.get('OBS_VALUE') or 0)
+            date_str = observation.get('TIME_PERIOD', '')
             
             if not value or not date_str:
-                logger.error("Invalid value or date in latest observation")
+                logger.error(f"Invalid value or date in observation {observation}")
                 return None
             
-            valid_from = self._format_date(date_str)
-            return value, valid_from
+            return value, self._format_date(date_str)
+            
+        except ValueError as e:
+            logger.error(f"Error parsing observation {observation}: {str(e)}")
+            return None
+
+    def _get_latest_value(self, conditional: bool = False) -> Optional[Tuple[float, datetime]]:
+        """Fetch the latest UMA value from INEGI's API"""
+        observations = self._fetch_observations(conditional)
+        if not observations:
+            return None
+        
+        latest = max(observations, key=lambda x: x.get('TIME_PERIOD', ''))
+        return self._parse_observation(latest)
+
+    def backfill_uma_values(self) -> Optional[Tuple[int, int]]:
+        """Store every UMA observation from one INEGI response.
+
+        Returns (observations parsed, rows inserted); periods that are
+        already stored are skipped.
+        """
+        observations = self._fetch_observations()
+        if not observations:
+            return None
+        
+        values = []
+        for observation in observations:
+            result = self._parse_observation(observation)
+            if result:
+                value, valid_from = result
+                values.append(UMAValue(daily_value=Decimal(str(value)), valid_from=valid_from.date()))
+        
+        try:
+            inserted = self.uma_repository.save_many(values)
+            self._store_cache()
+            logger.info(f"Backfilled {inserted} of {len(values)} UMA values")
+            return len(values), inserted
             
         except Exception as e:
-            logger.error(f"Error fetching UMA value: {str(e)}")
+            logger.error(f"Error backfilling UMA values: {str(e)}")
             return None
 
-    def update_uma_value(self) -> Optional[UMAValue]:
-        """Update UMA value in the repository"""
-        result = self._get_latest_value()
+    def update_uma_value(self, force: bool = False) -> Optional[UMAValue]:
+        """Update UMA value in the repository, skipping unchanged series unless forced"""
+        result = self._get_latest_value(conditional=not force)
         if not result:
             return None
             
         value, valid_from = result
-        uma_value = UMAValue(daily_value=value, valid_from=valid_from)
+        uma_value = UMAValue(daily_value=Decimal(str(value)), valid_from=valid_from.date())
         
         try:
-            self.uma_repository.save(uma_value)
-            logger.info(f"Updated UMA value to {value} valid from {valid_from}")
+            if self.uma_repository.save_many([uma_value]):
+                logger.info(f"Updated UMA value to {value} valid from {valid_from}")
+            else:
+                logger.info(f"UMA value valid from {valid_from} is already stored")
+            self._store_cache()
             return uma_value
             
         except Exception as e:
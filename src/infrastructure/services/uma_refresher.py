@@ -0,0 +1,162 @@
+import logging
+import os
+import random
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_try_advisory_xact_lock
+ADVISORY_LOCK_KEY = 628194
+
+class UMARefreshModel(db.Model):
+    """When any worker last fetched from INEGI, shared by every replica"""
+    __tablename__ = 'uma_refreshes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    fetched_at = db.Column(db.DateTime, nullable=False)
+
+class UMARefresher:
+    """Background thread that refreshes UMA values from INEGI on a schedule.
+
+    Every worker runs one. Each tick, the worker that wins a database
+    advisory lock fetches from INEGI unless another worker already did
+    within the interval, so one fetch per interval is made across all
+    replicas; every worker then drops its in-process UMA cache if
+    uma_values has changed, so new values are served without a restart.
+    Failed fetches back off exponentially.
+    """
+
+    def __init__(self, app, interval: float, jitter: float = 0.1,
+                 retry: Optional[float] = None, max_backoff: float = 3600):
+        self.app = app
+        self.interval = interval
+        self.jitter = jitter
+        self.retry = retry if retry is not None else min(interval, 60)
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self._fingerprint = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, app) -> Optional['UMARefresher']:
+        """Build a refresher if UMA_REFRESH_INTERVAL is set"""
+        interval = float(os.environ.get('UMA_REFRESH_INTERVAL', 0))
+        if interval <= 0:
+            return None
+        return cls(
+            app,
+            interval,
+            jitter=float(os.environ.get('UMA_REFRESH_JITTER', 0.1)),
+            max_backoff=float(os.environ.get('UMA_REFRESH_MAX_BACKOFF', 3600))
+        )
+
+    def ensure_started(self) -> None:
+        """Start the thread in this process if it is not running yet"""
+        # Threads don't survive fork, so a preloading server's workers each start their own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='uma-refresher', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the thread after its current tick"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._pid = None
+
+    def next_delay(self) -> float:
+        """Seconds until the next tick, backing off after failures"""
+        if self.failures:
+            delay = min(self.max_backoff, self.retry * 2 ** (self.failures - 1))
+        else:
+            delay = self.interval
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _run(self) -> None:
+        # Spread the first fetch so replicas started together don't hit INEGI at once
+        delay = self.interval * random.uniform(0, self.jitter)
+        while not self._stop.wait(delay):
+            with self.app.app_context():
+                try:
+                    self.tick()
+                except Exception as e:
+                    self.failures += 1
+                    logger.error(f"UMA refresh failed: {str(e)}")
+                finally:
+                    db.session.remove()
+            delay = self.next_delay()
+
+    def tick(self) -> None:
+        """Fetch from INEGI if this worker holds the lock and the fetch is due, then sync the local cache"""
+        with advisory_lock(ADVISORY_LOCK_KEY) as acquired:
+            # The lock is held until the block exits, so the check and the record can't interleave
+            if acquired and self.fetch_due():
+                self.refresh()
+                if not self.failures:
+                    self.record_fetch()
+        self.sync_cache()
+
+    def fetch_due(self) -> bool:
+        """Whether no worker has fetched successfully within the shortest jittered interval"""
+        state = db.session.get(UMARefreshModel, 1)
+        if state is None:
+            return True
+        window = timedelta(seconds=self.interval * (1 - self.jitter))
+        return datetime.utcnow() - state.fetched_at >= window
+
+    def record_fetch(self) -> None:
+        """Record a successful fetch for every worker to see"""
+        db.session.merge(UMARefreshModel(id=1, fetched_at=datetime.utcnow()))
+        db.session.commit()
+
+    def refresh(self) -> None:
+        """Run one conditional INEGI update"""
+        from src.infrastructure.services.inegi_service import INEGIService
+
+        service = INEGIService(UMARepository())
+        if service.update_uma_value() is None and not service.not_modified:
+            self.failures += 1
+            logger.warning(f"UMA refresh failed {self.failures} time(s) in a row")
+        else:
+            self.failures = 0
+
+    def sync_cache(self) -> None:
+        """Drop cached UMA reads if uma_values changed since the last tick"""
+        fingerprint = UMARepository().get_fingerprint()
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None:
+                logger.info("UMA values changed, invalidating the in-process cache")
+            uma_cache.invalidate()
+            self._fingerprint = fingerprint
+
+@contextmanager
+def advisory_lock(key: int):
+    """Try to take a transaction-scoped advisory lock; yields whether it was acquired.
+
+    Databases without advisory locks always acquire it.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        yield True
+        return
+    # A transaction-scoped lock also works through pgbouncer's transaction pooling
+    with db.engine.begin() as connection:
+        yield connection.execute(
+            text('SELECT pg_try_advisory_xact_lock(:key)'), {'key': key}
+        ).scalar()
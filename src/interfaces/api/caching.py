@@ -0,0 +1,43 @@
+# HTTP caching for the UMA endpoint
+import hashlib
+import os
+from datetime import datetime, time
+from typing import Dict, Tuple
+
+from src.domain.models import UMAValue
+
+# Upper bound on how long clients and proxies may cache /uma, and the bound
+# used once a new UMA value is overdue
+UMA_MAX_AGE = int(os.environ.get('UMA_MAX_AGE', 86400))
+UMA_OVERDUE_MAX_AGE = 300
+
+def uma_etag(uma: UMAValue) -> str:
+    """Strong ETag for a UMA period"""
+    return hashlib.sha256(f"{uma.valid_from.isoformat()}:{uma.daily_value}".encode()).hexdigest()[:32]
+
+def uma_max_age(uma: UMAValue) -> int:
+    """Seconds until the next UMA value is expected, capped at UMA_MAX_AGE.
+
+    UMA values change once a year, so the next one is expected on the
+    anniversary of valid_from. Once that has passed without a new row,
+    clients are asked to revalidate often until it arrives.
+    """
+    valid_from = uma.valid_from.date() if isinstance(uma.valid_from, datetime) else uma.valid_from
+    try:
+        expected_change = valid_from.replace(year=valid_from.year + 1)
+    except ValueError:
+        # Periods starting on February 29th
+        expected_change = valid_from.replace(year=valid_from.year + 1, month=3, day=1)
+
+    until_change = (datetime.combine(expected_change, time.min) - datetime.now()).total_seconds()
+    if until_change <= 0:
+        return min(UMA_MAX_AGE, UMA_OVERDUE_MAX_AGE)
+    return min(UMA_MAX_AGE, int(until_change))
+
+def uma_cache_headers(uma: UMAValue) -> Tuple[str, Dict[str, str]]:
+    """Return the ETag and the ETag/Cache-Control headers for a UMA response"""
+    etag = uma_etag(uma)
+    return etag, {
+        'ETag': f'"{etag}"',
+        'Cache-Control': f"public, max-age={uma_max_age(uma)}"
+    }
@@ -0,0 +1,41 @@
+# Lazily built API documentation
+import functools
+import threading
+
+from flask_apispec.extension import FlaskApiSpec
+
+class LazyFlaskApiSpec(FlaskApiSpec):
+    """FlaskApiSpec that converts registered views on the first /swagger/ request.
+
+    Spec generation walks every marshmallow schema, so doing it at startup
+    slows down every worker and CLI invocation that never serves the docs.
+    """
+
+    def __init__(self, app=None, document_options=True):
+        self._built = False
+        self._build_lock = threading.Lock()
+        super().__init__(app, document_options)
+
+    def _defer(self, callable, *args, **kwargs):
+        self._deferred.append(functools.partial(callable, *args, **kwargs))
+        self._built = False
+
+    def init_app(self, app):
+        # The parent replays deferred registrations here; hold them back
+        deferred, self._deferred = self._deferred, []
+        super().init_app(app)
+        self._deferred = deferred
+
+    def build(self):
+        """Convert every registered view into the spec, once"""
+        if self._built:
+            return
+        with self._build_lock:
+            if not self._built:
+                for deferred in self._deferred:
+                    deferred()
+                self._built = True
+
+    def swagger_json(self):
+        self.build()
+        return super().swagger_json()
@@ -0,0 +1,78 @@
+# Streaming CSV and NDJSON encoders for the ledger export
+import csv
+import io
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+COLUMNS = (
+    'employee_id',
+    'transaction_date',
+    'amount',
+    'cumulative_amount',
+    'annual_limit',
+    'remaining',
+    'over_limit'
+)
+
+# Rows encoded into each chunk written to the socket
+CHUNK_ROWS = 500
+
+def _chunks(rows: Iterable[Dict]) -> Iterator[list]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_ROWS))
+        if not chunk:
+            return
+        yield chunk
+
+def csv_chunks(rows: Iterable[Dict]) -> Iterator[str]:
+    """Encode rows as CSV with a header line"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for chunk in _chunks(rows):
+        writer.writerows(
+            (
+                row['employee_id'],
+                row['transaction_date'].isoformat(),
+                row['amount'],
+                row['cumulative_amount'],
+                f"{row['annual_limit']:.2f}",
+                f"{row['remaining']:.2f}",
+                'true' if row['over_limit'] else 'false'
+            )
+            for row in chunk
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for a year with no vouchers
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def ndjson_chunks(rows: Iterable[Dict]) -> Iterator[str]:
+    """Encode rows as one JSON object per line"""
+    for chunk in _chunks(rows):
+        yield ''.join(
+            json.dumps({
+                'employee_id': row['employee_id'],
+                'transaction_date': row['transaction_date'].isoformat(),
+                'amount': float(row['amount']),
+                'cumulative_amount': float(row['cumulative_amount']),
+                'annual_limit': float(row['annual_limit']),
+                'remaining': float(row['remaining']),
+                'over_limit': row['over_limit']
+            }) + '\n'
+            for row in chunk
+        )
+
+ENCODERS = {
+    'csv': csv_chunks,
+    'ndjson': ndjson_chunks
+}
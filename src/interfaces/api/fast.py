@@ -0,0 +1,120 @@
+# Precompiled request parsing and response serialization for the hot v1 routes
+import math
+import re
+from datetime import date
+
+import werkzeug
+from flask import current_app, jsonify, request
+from flask_apispec.wrapper import unpack
+from marshmallow import fields
+
+from src.interfaces.api import routes
+from src.interfaces.api.schemas import (
+    LimitResponseSchema,
+    RemainingLimitSchema,
+    UMAResponseSchema,
+    VoucherAmountSchema
+)
+
+# How marshmallow serializes each field type we use
+_CONVERTERS = {
+    fields.Boolean: bool,
+    fields.Float: float,
+    fields.Integer: int,
+    fields.String: str
+}
+
+ISO_DATE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+
+def compile_dumper(schema_class):
+    """Build a dump function equivalent to schema_class().dump for flat dict payloads"""
+    converters = []
+    for name, field in schema_class().fields.items():
+        if type(field) not in _CONVERTERS or field.data_key or field.attribute:
+            raise ValueError(f"{schema_class.__name__}.{name} cannot be precompiled")
+        converters.append((name, _CONVERTERS[type(field)]))
+    converters = tuple(converters)
+
+    def dump(obj):
+        return {
+            name: None if obj[name] is None else convert(obj[name])
+            for name, convert in converters
+            if name in obj
+        }
+    return dump
+
+dump_uma = compile_dumper(UMAResponseSchema)
+dump_limit = compile_dumper(LimitResponseSchema)
+dump_remaining = compile_dumper(RemainingLimitSchema)
+
+VOUCHER_FIELDS = frozenset(VoucherAmountSchema().fields)
+
+def parse_voucher():
+    """Parse a well-formed voucher body, or return None to let marshmallow handle it.
+
+    Only inputs marshmallow would accept unchanged take this path; anything
+    else (strings for numbers, nulls, unknown keys, bad dates) falls back so
+    error responses stay exactly as they were.
+    """
+    if not request.is_json:
+        return None
+    body = request.get_json(silent=True)
+    if type(body) is not dict or not body.keys() <= VOUCHER_FIELDS:
+        return None
+
+    amount = body.get('amount')
+    if type(amount) not in (int, float):
+        return None
+    try:
+        amount = float(amount)
+    except OverflowError:
+        return None
+    if not math.isfinite(amount):
+        return None
+    kwargs = {'amount': amount}
+
+    if 'transaction_date' in body:
+        match = ISO_DATE.match(body['transaction_date']) if type(body['transaction_date']) is str else None
+        if not match:
+            return None
+        try:
+            kwargs['transaction_date'] = date(*map(int, match.groups()))
+        except ValueError:
+            return None
+
+    if 'employee_id' in body:
+        employee_id = body['employee_id']
+        if type(employee_id) is not str or not 1 <= len(employee_id) <= 64:
+            return None
+        kwargs['employee_id'] = employee_id
+    return kwargs
+
+def _respond(rv, dump):
+    """Serialize a view result the way flask_apispec's marshal_with does"""
+    if isinstance(rv, werkzeug.Response):
+        return rv
+    data, status_code, headers = unpack(rv)
+    response = jsonify(dump(data))
+    return current_app.make_response((response, status_code, headers) if headers else (response, status_code))
+
+def get_uma_values():
+    return _respond(routes.get_uma_values.__wrapped__(), dump_uma)
+
+def validate_voucher():
+    kwargs = parse_voucher()
+    if kwargs is None:
+        return routes.validate_voucher()
+    return _respond(routes.validate_voucher.__wrapped__(**kwargs), dump_limit)
+
+def get_remaining_limit():
+    return _respond(routes.get_remaining_limit.__wrapped__(), dump_remaining)
+
+FAST_VIEWS = {
+    'api.get_uma_values': get_uma_values,
+    'api.validate_voucher': validate_voucher,
+    'api.get_remaining_limit': get_remaining_limit
+}
+
+def install_fast_paths(app):
+    """Serve the /uma, /vouchers/validate and /vouchers/remaining routes without marshmallow"""
+    app.view_functions.update(FAST_VIEWS)
@@ -1,22 +1,28 @@
 from datetime import datetime
 from decimal import Decimal
-from flask import request, jsonify
+from flask import Response, request, jsonify, stream_with_context
 from flask_apispec import use_kwargs, marshal_with, doc
 
 from src.interfaces.api import api
+from src.interfaces.api.caching import uma_cache_headers
+from src.interfaces.api.export import ENCODERS, EXPORT_FORMATS
 from src.interfaces.api.schemas import (
     UMAResponseSchema, 
     VoucherAmountSchema, 
+    VoucherBatchSchema,
     LimitResponseSchema,
-    RemainingLimitSchema
+    BatchLimitResponseSchema,
+    RemainingLimitSchema,
+    SimulationSchema
 )
-from src.domain.exceptions import VoucherError
+from src.domain.exceptions import UMANotFoundError
 from src.application.services import VoucherService
-from src.infrastructure.repositories.uma_repository import UMARepository
+from src.infrastructure.idempotency import idempotent
+from src.infrastructure.repositories.uma_repository import CachedUMARepository
 from src.infrastructure.repositories.transaction_repository import TransactionRepository
 
 # Initialize repositories and services
-uma_repository = UMARepository()
+uma_repository = CachedUMARepository()
 transaction_repository = TransactionRepository()
 voucher_service = VoucherService(uma_repository, transaction_repository)
 
@@ -30,18 +36,25 @@ def get_uma_values():
     """Get current UMA values and limits"""
     current_uma = uma_repository.get_current_value()
     if not current_uma:
-        return jsonify({'error': 'No UMA value found'}), 404
+        response = jsonify({'error': 'No UMA value found'})
+        response.status_code = 404
+        return response
+
+    etag, headers = uma_cache_headers(current_uma)
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers=headers)
         
-    limits = VoucherLimits(current_uma.daily_value)
+    limits = current_uma.limits
     return {
         'daily_value': float(current_uma.daily_value),
         'monthly_value': float(limits.monthly_uma),
         'max_monthly_deposit': float(limits.monthly_uma),
         'max_annual_deposit': float(limits.max_annual_amount),
         'annual_deposits_allowed': limits.annual_max_deposits
-    }
+    }, 200, headers
 
 @api.route('/vouchers/validate', methods=['POST'])
+@idempotent
 @doc(
     tags=['Vouchers'],
     description='Validate if voucher amount is within allowed limits'
@@ -50,50 +63,174 @@ def get_uma_values():
 @marshal_with(LimitResponseSchema)
 def validate_voucher(**kwargs):
     """Validate if voucher amount is within limits"""
+    transaction_date = kwargs.get('transaction_date')
+    employee_id = kwargs.get('employee_id', '')
     try:
         amount = Decimal(str(kwargs.get('amount', 0)))
-        response = voucher_service.validate_voucher(amount)
+        response = voucher_service.validate_voucher(amount, employee_id, transaction_date)
         if not response['is_valid']:
             return response, 400
         return response
+    except UMANotFoundError as e:
+        response = jsonify({'error': e.message})
+        response.status_code = e.code
+        return response
     except (TypeError, ValueError) as e:
         return {
             'is_valid': False,
             'current_amount': kwargs.get('amount', 0),
-            'limit': float(limits.max_annual_amount),
-            'remaining': float(voucher_service.get_annual_remaining()),
             'message': str(e) or 'Invalid amount format'
         }, 400
-    except VoucherError as e:
-        return {
-            'is_valid': False,
-            'current_amount': kwargs.get('amount', 0),
-            'limit': float(limits.max_annual_amount),
-            'remaining': float(voucher_service.get_annual_remaining()),
-            'message': str(e)
-        }, 400
+
+@api.route('/vouchers/validate/batch', methods=['POST'])
+@idempotent
+@doc(
+    tags=['Vouchers'],
+    description='Validate many voucher amounts in one request'
+)
+@use_kwargs(VoucherBatchSchema)
+@marshal_with(BatchLimitResponseSchema)
+def validate_voucher_batch(**kwargs):
+    """Validate a batch of voucher amounts against current limits"""
+    if not uma_repository.get_current_value():
+        response = jsonify({'error': 'No UMA value found'})
+        response.status_code = 404
+        return response
+
+    vouchers = [
+        (
+            Decimal(str(voucher['amount'])),
+            voucher.get('transaction_date'),
+            voucher.get('employee_id', '')
+        )
+        for voucher in kwargs['vouchers']
+    ]
+    results = voucher_service.validate_vouchers(vouchers)
+    valid_count = sum(1 for result in results if result['is_valid'])
+    return {
+        'results': results,
+        'valid_count': valid_count,
+        'invalid_count': len(results) - valid_count
+    }
+
+@api.route('/vouchers/issue', methods=['POST'])
+@idempotent
+@doc(
+    tags=['Vouchers'],
+    description='Record a voucher if it is within allowed limits'
+)
+@use_kwargs(VoucherAmountSchema)
+@marshal_with(LimitResponseSchema)
+def issue_voucher(**kwargs):
+    """Check limits and record the voucher atomically"""
+    amount = Decimal(str(kwargs['amount']))
+    try:
+        response = voucher_service.issue_voucher(
+            amount, kwargs.get('transaction_date'), kwargs.get('employee_id', '')
+        )
+    except UMANotFoundError as e:
+        response = jsonify({'error': e.message})
+        response.status_code = e.code
+        return response
+
+    if not response['is_valid']:
+        return response, 400
+    return response, 201
 
 @api.route('/vouchers/remaining', methods=['GET'])
 @doc(
     tags=['Vouchers'],
-    description='Get remaining annual voucher limit'
+    description='Get remaining annual voucher limit',
+    params={
+        'year': {'description': 'Year to check (defaults to the current year)', 'in': 'query', 'type': 'integer'},
+        'employee_id': {'description': 'Employee whose limit to check (optional)', 'in': 'query', 'type': 'string'}
+    }
 )
 @marshal_with(RemainingLimitSchema)
 def get_remaining_limit():
     """Get remaining annual voucher limit"""
     year = request.args.get('year', datetime.now().year, type=int)
-    current_uma = uma_repository.get_current_value()
-    limits = VoucherLimits(current_uma.daily_value)
-    remaining = voucher_service.get_annual_remaining(year)
+    employee_id = request.args.get('employee_id', '')
+    try:
+        limits = voucher_service.get_annual_limits(year)
+        remaining = voucher_service.get_annual_remaining(year, employee_id)
+    except UMANotFoundError as e:
+        response = jsonify({'error': e.message})
+        response.status_code = e.code
+        return response
     
-    return {
+    response = {
         'year': year,
         'remaining_limit': float(remaining),
         'annual_limit': float(limits.max_annual_amount)
     }
+    if employee_id:
+        response['employee_id'] = employee_id
+    return response
+
+@api.route('/vouchers/export', methods=['GET'])
+@doc(
+    tags=['Vouchers'],
+    description='Stream a year\'s voucher ledger with cumulative usage per employee against the annual limit',
+    params={
+        'year': {'description': 'Year to export (defaults to the current year)', 'in': 'query', 'type': 'integer'},
+        'format': {'description': 'csv (default) or ndjson', 'in': 'query', 'type': 'string'}
+    }
+)
+def export_vouchers():
+    """Stream the voucher ledger for a year as CSV or NDJSON"""
+    year = request.args.get('year', datetime.now().year, type=int)
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        response = jsonify({'error': f"Unsupported format {export_format!r}; use csv or ndjson"})
+        response.status_code = 400
+        return response
+
+    try:
+        rows = voucher_service.export_ledger(year)
+    except UMANotFoundError as e:
+        response = jsonify({'error': e.message})
+        response.status_code = e.code
+        return response
+
+    # No Content-Length, so the body goes out with chunked transfer encoding
+    # while the cursor is read, and the session stays open until it is done
+    return Response(
+        stream_with_context(ENCODERS[export_format](rows)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename=vouchers-{year}.{export_format}'}
+    )
+
+@api.route('/vouchers/simulate', methods=['POST'])
+@doc(
+    tags=['Vouchers'],
+    description='Evaluate deposit plans against many candidate daily UMA values in one vectorized batch'
+)
+@use_kwargs(SimulationSchema)
+def simulate_limits(**kwargs):
+    """Monthly and annual caps per scenario, and where each deposit plan breaches them"""
+    from src.application.simulator import simulate
+
+    plans = [(plan['employee_id'], plan['deposits']) for plan in kwargs['deposit_plans']]
+    try:
+        result = simulate(kwargs['daily_values'], plans)
+    except ValueError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 400
+        return response
+    except RuntimeError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 501
+        return response
+    # Columnar lists go straight to JSON; a response schema would dump them item by item
+    return jsonify(result)
 
 def register_api_documentation(docs):
     """Register API documentation after app initialization"""
     docs.register(get_uma_values, blueprint='api')
     docs.register(validate_voucher, blueprint='api')
+    docs.register(validate_voucher_batch, blueprint='api')
+    docs.register(issue_voucher, blueprint='api')
     docs.register(get_remaining_limit, blueprint='api')
+    docs.register(export_vouchers, blueprint='api')
+    docs.register(simulate_limits, blueprint='api')
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 class UMAResponseSchema(Schema):
     daily_value = fields.Float(description="Daily UMA value")
@@ -9,7 +9,23 @@ class UMAResponseSchema(Schema):
 
 class VoucherAmountSchema(Schema):
     amount = fields.Float(required=True, description="Voucher amount to validate")
-    transaction_date = fields.Date(required=False, description="Transaction date (optional)")
+    transaction_date = fields.Date(
+        required=False,
+        description="Transaction date (optional); selects the UMA value in effect on that date"
+    )
+    employee_id = fields.String(
+        required=False,
+        validate=validate.Length(min=1, max=64),
+        description="Employee whose annual limit applies (optional)"
+    )
+
+class VoucherBatchSchema(Schema):
+    vouchers = fields.List(
+        fields.Nested(VoucherAmountSchema),
+        required=True,
+        validate=validate.Length(min=1, max=10000),
+        description="Voucher amounts to validate (up to 10000)"
+    )
 
 class LimitResponseSchema(Schema):
     is_valid = fields.Boolean(description="Whether the amount is within limits")
@@ -18,7 +34,33 @@ class LimitResponseSchema(Schema):
     remaining = fields.Float(description="Remaining amount available")
     message = fields.String(description="Error message if any")
 
+class BatchLimitResponseSchema(Schema):
+    results = fields.List(fields.Nested(LimitResponseSchema), description="One result per voucher, in request order")
+    valid_count = fields.Integer(description="Number of vouchers within limits")
+    invalid_count = fields.Integer(description="Number of vouchers exceeding limits or invalid")
+
 class RemainingLimitSchema(Schema):
     year = fields.Integer(description="Year for the limit calculation")
+    employee_id = fields.String(description="Employee the limit applies to, if any")
     remaining_limit = fields.Float(description="Remaining amount available for the year")
     annual_limit = fields.Float(description="Total annual limit")
+
+class DepositPlanSchema(Schema):
+    employee_id = fields.String(required=True, validate=validate.Length(min=1, max=64), description="Employee the plan is for")
+    deposits = fields.List(
+        fields.Float(),
+        required=True,
+        validate=validate.Length(min=1, max=366),
+        description="Planned voucher amounts in issue order"
+    )
+
+class SimulationSchema(Schema):
+    # Validated by the simulator in one vectorized pass; a List(Float) field
+    # would cost more than the simulation itself for large batches
+    daily_values = fields.Raw(required=True, description="Candidate daily UMA values, one scenario each")
+    deposit_plans = fields.List(
+        fields.Nested(DepositPlanSchema),
+        required=True,
+        validate=validate.Length(min=1, max=1000),
+        description="Deposit plans evaluated under every scenario"
+    )
@@ -0,0 +1 @@
+# Async (ASGI) interface - serves the v1 API on an async stack
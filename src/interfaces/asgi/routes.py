@@ -0,0 +1,113 @@
+from datetime import datetime
+from decimal import Decimal
+from marshmallow import ValidationError
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from werkzeug.http import parse_etags
+
+from src.interfaces.api.caching import uma_cache_headers
+from src.interfaces.api.schemas import (
+    UMAResponseSchema,
+    VoucherAmountSchema,
+    LimitResponseSchema,
+    RemainingLimitSchema
+)
+from src.domain.exceptions import UMANotFoundError
+from src.application.services import VoucherService
+from src.infrastructure.repositories.async_repositories import (
+    PreloadedTransactionRepository,
+    PreloadedUMARepository
+)
+
+uma_response_schema = UMAResponseSchema()
+voucher_amount_schema = VoucherAmountSchema()
+limit_response_schema = LimitResponseSchema()
+remaining_limit_schema = RemainingLimitSchema()
+
+def _not_found(error: UMANotFoundError) -> JSONResponse:
+    return JSONResponse({'error': error.message}, status_code=error.code)
+
+async def _load_service(request, year: int, employee_id: str) -> VoucherService:
+    """Load everything VoucherService reads, then hand it in-memory repositories"""
+    index = await request.app.state.uma_repository.get_index()
+    totals = {}
+    if year is not None:
+        used = await request.app.state.transaction_repository.get_annual_total(year, employee_id)
+        totals[(year, employee_id)] = used
+    return VoucherService(
+        PreloadedUMARepository(index),
+        PreloadedTransactionRepository(totals)
+    )
+
+async def get_uma_values(request):
+    """Get current UMA values and limits"""
+    service = await _load_service(request, None, '')
+    try:
+        current_uma = service.get_uma()
+    except UMANotFoundError as e:
+        return _not_found(e)
+
+    etag, headers = uma_cache_headers(current_uma)
+    if parse_etags(request.headers.get('if-none-match')).contains_weak(etag):
+        return Response(status_code=304, headers=headers)
+
+    limits = current_uma.limits
+    return JSONResponse(uma_response_schema.dump({
+        'daily_value': float(current_uma.daily_value),
+        'monthly_value': float(limits.monthly_uma),
+        'max_monthly_deposit': float(limits.monthly_uma),
+        'max_annual_deposit': float(limits.max_annual_amount),
+        'annual_deposits_allowed': limits.annual_max_deposits
+    }), headers=headers)
+
+async def validate_voucher(request):
+    """Validate if voucher amount is within limits"""
+    try:
+        kwargs = voucher_amount_schema.load(await request.json())
+    except ValidationError as e:
+        return JSONResponse({'errors': {'json': e.messages}}, status_code=422)
+    except ValueError:
+        return JSONResponse({'errors': {'json': {'_schema': ['Invalid JSON body.']}}}, status_code=422)
+
+    amount = Decimal(str(kwargs['amount']))
+    transaction_date = kwargs.get('transaction_date')
+    employee_id = kwargs.get('employee_id', '')
+    year = transaction_date.year if transaction_date else datetime.now().year
+    service = await _load_service(request, year, employee_id)
+
+    try:
+        response = service.validate_voucher(amount, employee_id, transaction_date)
+        status_code = 200 if response['is_valid'] else 400
+    except UMANotFoundError as e:
+        return _not_found(e)
+    return JSONResponse(limit_response_schema.dump(response), status_code=status_code)
+
+async def get_remaining_limit(request):
+    """Get remaining annual voucher limit"""
+    try:
+        year = int(request.query_params.get('year', ''))
+    except ValueError:
+        year = datetime.now().year
+    employee_id = request.query_params.get('employee_id', '')
+    service = await _load_service(request, year, employee_id)
+
+    try:
+        limits = service.get_annual_limits(year)
+        remaining = service.get_annual_remaining(year, employee_id)
+    except UMANotFoundError as e:
+        return _not_found(e)
+
+    response = {
+        'year': year,
+        'remaining_limit': float(remaining),
+        'annual_limit': float(limits.max_annual_amount)
+    }
+    if employee_id:
+        response['employee_id'] = employee_id
+    return JSONResponse(remaining_limit_schema.dump(response))
+
+routes = [
+    Route('/api/v1/uma', get_uma_values, methods=['GET']),
+    Route('/api/v1/vouchers/validate', validate_voucher, methods=['POST']),
+    Route('/api/v1/vouchers/remaining', get_remaining_limit, methods=['GET'])
+]
@@ -1,18 +1,142 @@
 import click
+import time
 from flask.cli import with_appcontext
 
-from src.infrastructure.services.inegi_service import INEGIService
-from src.infrastructure.repositories.uma_repository import UMARepository
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import CachedUMARepository
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create any missing database tables"""
+    db.create_all()
+    click.echo("Database tables created")
 
 @click.command('update-uma')
+@click.option('--force', is_flag=True, help='Ignore the cached INEGI response and always refetch')
 @with_appcontext
-def update_uma_command():
+def update_uma_command(force):
     """Update UMA value from INEGI"""
-    uma_repository = UMARepository()
+    from src.infrastructure.services.inegi_service import INEGIService
+
+    uma_repository = CachedUMARepository()
     service = INEGIService(uma_repository)
-    result = service.update_uma_value()
+    result = service.update_uma_value(force=force)
     
     if result:
         click.echo(f"Successfully updated UMA value to {result.daily_value}")
+    elif service.not_modified:
+        click.echo("UMA value unchanged since last check")
     else:
         click.echo("Failed to update UMA value")
+
+@click.command('backfill-uma')
+@with_appcontext
+def backfill_uma_command():
+    """Store every historical UMA value from INEGI in one request"""
+    from src.infrastructure.services.inegi_service import INEGIService
+
+    uma_repository = CachedUMARepository()
+    service = INEGIService(uma_repository)
+    result = service.backfill_uma_values()
+    
+    if result:
+        parsed, inserted = result
+        click.echo(f"Backfilled {inserted} UMA value(s), {parsed - inserted} already stored")
+    else:
+        click.echo("Failed to backfill UMA values")
+
+@click.command('reconcile-totals')
+@click.option('--dry-run', is_flag=True, help='Report drift without rebuilding totals')
+@with_appcontext
+def reconcile_totals_command(dry_run):
+    """Rebuild annual voucher totals from the transaction ledger"""
+    repository = TransactionRepository()
+    drift = repository.reconcile_annual_totals(dry_run=dry_run)
+
+    for employee_id, year, stored, actual in drift:
+        label = f"{employee_id or '(unassigned)'} {year}"
+        click.echo(f"{label}: stored {stored:.2f}, ledger {actual:.2f}, drift {actual - stored:.2f}")
+
+    if not drift:
+        click.echo("Annual totals match the ledger")
+    elif dry_run:
+        click.echo(f"Found drift in {len(drift)} employee year(s)")
+    else:
+        click.echo(f"Rebuilt annual totals, corrected {len(drift)} employee year(s)")
+
+@click.command('import-transactions')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'jsonl']),
+              help='File format; inferred from the extension by default')
+@click.option('--chunk-size', default=5000, show_default=True, help='Rows validated and written per transaction')
+@click.option('--dry-run', is_flag=True, help='Validate the file without writing anything')
+@with_appcontext
+def import_transactions_command(path, file_format, chunk_size, dry_run):
+    """Stream historical voucher transactions from a CSV or JSON-lines file"""
+    from src.application.transaction_import import import_transactions
+
+    started = time.perf_counter()
+    try:
+        result = import_transactions(
+            path, TransactionRepository(), format=file_format, chunk_size=chunk_size, dry_run=dry_run
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    elapsed = time.perf_counter() - started
+
+    for line, message in result.errors:
+        click.echo(f"line {line}: {message}")
+    if result.skipped > len(result.errors):
+        click.echo(f"... and {result.skipped - len(result.errors)} more invalid row(s)")
+
+    verb = "Validated" if dry_run else "Imported"
+    rate = result.imported / elapsed if elapsed else 0
+    click.echo(
+        f"{verb} {result.imported} transaction(s), skipped {result.skipped} invalid row(s) "
+        f"in {elapsed:.1f}s ({rate:.0f} rows/s)"
+    )
+
+@click.command('simulate-limits')
+@click.argument('path', type=click.File('r'))
+@click.option('--output', type=click.File('w'), default='-', help='Where to write the JSON results (default: stdout)')
+def simulate_limits_command(path, output):
+    """Evaluate deposit plans against candidate daily UMA values from a JSON file.
+
+    The file has the same shape as the /vouchers/simulate request body:
+    {"daily_values": [...], "deposit_plans": [{"employee_id": ..., "deposits": [...]}]}
+    """
+    import json
+    from src.application.simulator import simulate
+
+    try:
+        spec = json.load(path)
+        plans = [(plan['employee_id'], plan['deposits']) for plan in spec['deposit_plans']]
+        started = time.perf_counter()
+        result = simulate(spec['daily_values'], plans)
+    except (KeyError, TypeError, ValueError, RuntimeError) as e:
+        raise click.ClickException(f"Cannot simulate {path.name}: {str(e)}")
+    elapsed = time.perf_counter() - started
+
+    json.dump(result, output)
+    output.write('\n')
+    click.echo(
+        f"Simulated {len(spec['daily_values'])} scenario(s) x {len(plans)} plan(s) in {elapsed:.3f}s", err=True
+    )
+
+@click.command('profile-top')
+@click.option('--limit', default=20, show_default=True, help='Number of functions to show')
+@click.option('--sort', default='cumulative', show_default=True, help='pstats sort key, e.g. cumulative or tottime')
+@click.option('--endpoint', help='Only merge profiles of this endpoint, e.g. api.validate_voucher')
+def profile_top_command(limit, sort, endpoint):
+    """Show the top hotspots across stored request profiles"""
+    from src.infrastructure.profiling import ProfileRing, profile_dir
+
+    ring = ProfileRing(profile_dir())
+    report = ring.top(limit=limit, sort=sort, endpoint=endpoint)
+    if not report:
+        click.echo(f"No profiles found in {ring.directory}")
+        return
+    click.echo(f"Merged {len(ring.files(endpoint))} profile(s) from {ring.directory}")
+    click.echo(report)
@@ -0,0 +1,5 @@
+from flask import Blueprint
+
+ops = Blueprint('ops', __name__)
+
+from . import routes
@@ -0,0 +1,49 @@
+import time
+from flask import Response, current_app, g, jsonify, request
+
+from src.interfaces.ops import ops
+from src.infrastructure.database import db
+from src.infrastructure.metrics import REGISTRY, CallbackMetric, http_request_duration
+from src.infrastructure.pool import pool_stats
+
+def _pool_samples(key):
+    stats = pool_stats(db.engine)
+    return [({}, stats[key])] if key in stats else []
+
+CallbackMetric('db_pool_checked_out', 'Connections currently checked out of the pool', 'gauge',
+               lambda: _pool_samples('checked_out'))
+CallbackMetric('db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection', 'counter',
+               lambda: _pool_samples('wait_seconds_total'))
+
+def _replica_lag_samples():
+    router = current_app.extensions.get('replicas')
+    if router is None:
+        return []
+    return [({'replica': key}, lag) for key, lag in sorted(router.lags().items())]
+
+CallbackMetric('db_replica_lag_seconds', 'Replication lag from the last check of each read replica', 'gauge',
+               _replica_lag_samples)
+
+@ops.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@ops.after_app_request
+def record_request_duration(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        http_request_duration.labels(
+            route, request.method, str(response.status_code)
+        ).observe(time.perf_counter() - started)
+    return response
+
+@ops.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Get process metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@ops.route('/stats/pool', methods=['GET'])
+def get_pool_stats():
+    """Get connection pool usage for this worker"""
+    return jsonify(pool_stats(db.engine))
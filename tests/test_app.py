@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+from sqlalchemy import inspect
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.infrastructure.database import db
+
+def test_create_app_creates_tables_by_default(monkeypatch):
+    """Test development apps create missing tables on startup"""
+    monkeypatch.delenv('APP_ENV', raising=False)
+    app = create_app()
+    with app.app_context():
+        assert 'uma_values' in inspect(db.engine).get_table_names()
+
+def test_create_app_skips_tables_in_production(monkeypatch):
+    """Test production apps leave schema creation to flask init-db"""
+    monkeypatch.setenv('APP_ENV', 'production')
+    app = create_app()
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+
+        result = app.test_cli_runner().invoke(args=['init-db'])
+        assert "Database tables created" in result.output
+        assert 'uma_values' in inspect(db.engine).get_table_names()
+
+def test_swagger_spec_built_on_first_request():
+    """Test the OpenAPI spec is generated lazily, once"""
+    app = create_app(create_tables=False)
+    docs = app.extensions['apispec']
+    assert docs.spec.to_dict()['paths'] == {}
+
+    response = app.test_client().get('/swagger/')
+    assert response.status_code == 200
+    paths = response.get_json()['paths']
+    assert '/api/v1/vouchers/validate' in paths
+    assert app.test_client().get('/swagger/').get_json()['paths'] == paths
+
+def test_module_app_is_lazy():
+    """Test importing src.app does not build an app until one is asked for"""
+    output = subprocess.run(
+        [sys.executable, '-c', "import src.app as m; print('app' in vars(m)); m.app; print('app' in vars(m))"],
+        capture_output=True, text=True, check=True,
+        env={**os.environ, 'DATABASE_URL': 'sqlite:///:memory:'}
+    ).stdout.split()
+    assert output == ['False', 'True']
@@ -0,0 +1,95 @@
+import os
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+pytest.importorskip('starlette')
+pytest.importorskip('aiosqlite')
+pytest.importorskip('httpx')
+
+from starlette.testclient import TestClient
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.asgi import create_asgi_app
+from src.domain.models import UMAValue, VoucherLimits, VoucherTransaction
+from src.infrastructure.async_database import async_database_url
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+
+DAILY_UMA = Decimal('108.57')
+LIMITS = VoucherLimits(DAILY_UMA)
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Create the sync application over a SQLite file the async app can share."""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'asgi.db'}")
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(DAILY_UMA, date(2024, 1, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    with TestClient(create_asgi_app()) as client:
+        yield client
+
+def test_async_database_url():
+    """Test sync URLs map onto async drivers"""
+    assert async_database_url('postgresql://u:p@db/uma') == 'postgresql+asyncpg://u:p@db/uma'
+    assert async_database_url('sqlite:///x.db') == 'sqlite+aiosqlite:///x.db'
+
+def test_get_uma_values(client):
+    """Test current UMA values are served asynchronously"""
+    response = client.get('/api/v1/uma')
+    assert response.status_code == 200
+    assert response.json() == {
+        'daily_value': float(DAILY_UMA),
+        'monthly_value': float(LIMITS.monthly_uma),
+        'max_monthly_deposit': float(LIMITS.monthly_uma),
+        'max_annual_deposit': float(LIMITS.max_annual_amount),
+        'annual_deposits_allowed': 7
+    }
+    etag = response.headers['ETag']
+    assert client.get('/api/v1/uma', headers={'If-None-Match': etag}).status_code == 304
+
+def test_validate_voucher(client):
+    """Test validation matches the sync service results"""
+    response = client.post('/api/v1/vouchers/validate', json={'amount': 1000.0})
+    assert response.status_code == 200
+    assert response.json()['is_valid'] is True
+
+    response = client.post('/api/v1/vouchers/validate', json={'amount': float(LIMITS.monthly_uma) + 1})
+    assert response.status_code == 400
+    assert 'exceeds monthly UMA limit' in response.json()['message']
+
+    response = client.post('/api/v1/vouchers/validate', json={'amount': -1.0})
+    assert response.status_code == 400
+    assert response.json()['message'] == 'Invalid amount'
+
+    response = client.post('/api/v1/vouchers/validate', json={})
+    assert response.status_code == 422
+
+    response = client.post('/api/v1/vouchers/validate', json={'amount': -1.0, 'transaction_date': '2020-01-01'})
+    assert response.status_code == 404
+
+def test_get_remaining_limit(client, app):
+    """Test the remaining limit reflects recorded transactions"""
+    year = datetime.now().year
+    with app.app_context():
+        TransactionRepository().save(VoucherTransaction(Decimal('1000.00'), date(year, 3, 1), 'E-1'))
+
+    response = client.get(f'/api/v1/vouchers/remaining?year={year}&employee_id=E-1')
+    assert response.status_code == 200
+    data = response.json()
+    assert data['employee_id'] == 'E-1'
+    assert data['remaining_limit'] == float(LIMITS.max_annual_amount - 1000)
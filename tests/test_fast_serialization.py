@@ -0,0 +1,96 @@
+import os
+import pytest
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue, VoucherTransaction
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+from src.interfaces.api.fast import compile_dumper
+from src.interfaces.api.schemas import LimitResponseSchema, VoucherBatchSchema
+
+REQUESTS = [
+    ('GET', '/api/v1/uma', {}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 1000}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 1000.5, 'employee_id': 'EMP1'}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 3000, 'employee_id': 'EMP1'}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 5000}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 100, 'transaction_date': '2023-06-01'}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 100, 'transaction_date': '2020-06-01'}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 0}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': '100'}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': None}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': True}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 100, 'extra': 1}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 100, 'transaction_date': '2024-02-30'}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': {'amount': 100, 'employee_id': ''}}),
+    ('POST', '/api/v1/vouchers/validate', {'json': [100]}),
+    ('POST', '/api/v1/vouchers/validate', {'data': 'amount=100'}),
+    ('POST', '/api/v1/vouchers/validate', {'data': '{"amount": ', 'content_type': 'application/json'}),
+    ('GET', '/api/v1/vouchers/remaining', {}),
+    ('GET', '/api/v1/vouchers/remaining', {'query_string': {'year': 2023, 'employee_id': 'EMP1'}}),
+]
+
+@pytest.fixture
+def clients(monkeypatch, tmp_path):
+    """Test clients for the marshmallow and fast paths over one database."""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'fast.db'}")
+    monkeypatch.delenv('FAST_SERIALIZATION', raising=False)
+    slow = create_app()
+    monkeypatch.setenv('FAST_SERIALIZATION', '1')
+    fast = create_app()
+    slow.config['TESTING'] = fast.config['TESTING'] = True
+
+    with slow.app_context():
+        uma_cache.invalidate()
+        yield slow.test_client(), fast.test_client()
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+def assert_same_responses(slow, fast):
+    for method, path, kwargs in REQUESTS:
+        expected = slow.open(path, method=method, **kwargs)
+        actual = fast.open(path, method=method, **kwargs)
+        assert (actual.status_code, actual.headers['Content-Type'], actual.data) == \
+            (expected.status_code, expected.headers['Content-Type'], expected.data), (method, path, kwargs)
+
+def test_fast_path_is_byte_compatible(clients):
+    """Test the fast path returns exactly what marshmallow returns"""
+    slow, fast = clients
+    UMARepository().save(UMAValue(Decimal('103.74'), date(2023, 2, 1)))
+    UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 2, 1)))
+    TransactionRepository().save(VoucherTransaction(Decimal('20500.00'), date.today(), 'EMP1'))
+    uma_cache.invalidate()
+    assert_same_responses(slow, fast)
+
+def test_fast_path_without_uma(clients):
+    """Test the missing-UMA responses also match"""
+    slow, fast = clients
+    for method, path, kwargs in REQUESTS[:3]:
+        expected = slow.open(path, method=method, **kwargs)
+        actual = fast.open(path, method=method, **kwargs)
+        assert (actual.status_code, actual.data) == (expected.status_code, expected.data)
+
+def test_compile_dumper_matches_schema():
+    """Test precompiled dumpers convert fields like the schema does"""
+    result = {'is_valid': False, 'current_amount': Decimal('5.5'), 'limit': Decimal('23103.696'),
+              'remaining': Decimal('1.25'), 'message': 'Too much'}
+    assert compile_dumper(LimitResponseSchema)(result) == LimitResponseSchema().dump(result)
+    with pytest.raises(ValueError):
+        compile_dumper(VoucherBatchSchema)
+
+def test_fast_path_skips_webargs(clients, mocker):
+    """Test well-formed requests are served without marshmallow parsing"""
+    from webargs.flaskparser import FlaskParser
+
+    _, fast = clients
+    UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 2, 1)))
+    parse = mocker.patch.object(FlaskParser, 'parse', side_effect=AssertionError('marshmallow path used'))
+    response = fast.post('/api/v1/vouchers/validate', json={'amount': 100, 'employee_id': 'EMP1'})
+    assert response.status_code == 200
+    parse.assert_not_called()
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.database import db
+from src.infrastructure.idempotency import (
+    DatabaseIdempotencyStore,
+    IdempotentResponse,
+    MemoryIdempotencyStore
+)
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+from src.interfaces.api import routes
+
+VOUCHER = {'amount': 1000.0, 'employee_id': 'EMP1', 'transaction_date': date.today().isoformat()}
+
+@pytest.fixture(params=['memory', 'database'])
+def app(request, monkeypatch):
+    """Create application for the tests with each store."""
+    monkeypatch.setenv('IDEMPOTENCY_STORE', request.param)
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(Decimal('108.57'), datetime(date.today().year, 1, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def test_issue_replays_without_double_counting(client, mocker):
+    """Test a retried issue returns the stored response and records one voucher"""
+    issue = mocker.spy(routes.voucher_service, 'issue_voucher')
+    headers = {'Idempotency-Key': 'payroll-1'}
+
+    first = client.post('/api/v1/vouchers/issue', json=VOUCHER, headers=headers)
+    second = client.post('/api/v1/vouchers/issue', json=VOUCHER, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.get_data() == first.get_data()
+    assert second.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+    assert issue.call_count == 1
+    assert TransactionRepository().get_annual_total(date.today().year, 'EMP1') == Decimal('1000.00')
+
+def test_without_key_every_request_runs(client):
+    """Test requests without the header are not deduplicated"""
+    client.post('/api/v1/vouchers/issue', json=VOUCHER)
+    client.post('/api/v1/vouchers/issue', json=VOUCHER)
+    assert TransactionRepository().get_annual_total(date.today().year, 'EMP1') == Decimal('2000.00')
+
+def test_key_reused_with_different_body(client):
+    """Test a key cannot be reused for a different request"""
+    headers = {'Idempotency-Key': 'payroll-2'}
+    client.post('/api/v1/vouchers/issue', json=VOUCHER, headers=headers)
+    response = client.post('/api/v1/vouchers/issue', json={**VOUCHER, 'amount': 5.0}, headers=headers)
+    assert response.status_code == 422
+
+def test_keys_are_scoped_to_the_route(client, mocker):
+    """Test the same key on validate and issue runs both"""
+    validate = mocker.spy(routes.voucher_service, 'validate_voucher')
+    headers = {'Idempotency-Key': 'payroll-3'}
+    assert client.post('/api/v1/vouchers/validate', json=VOUCHER, headers=headers).status_code == 200
+    assert client.post('/api/v1/vouchers/issue', json=VOUCHER, headers=headers).status_code == 201
+    assert client.post('/api/v1/vouchers/validate', json=VOUCHER, headers=headers).status_code == 200
+    assert validate.call_count == 1
+
+def test_server_errors_are_not_stored(client, mocker):
+    """Test a failed request can be retried with the same key"""
+    mocker.patch.object(routes.voucher_service, 'validate_vouchers', side_effect=[RuntimeError('down'), []])
+    headers = {'Idempotency-Key': 'payroll-4'}
+    body = {'vouchers': [VOUCHER]}
+
+    with pytest.raises(RuntimeError):
+        client.post('/api/v1/vouchers/validate/batch', json=body, headers=headers)
+    response = client.post('/api/v1/vouchers/validate/batch', json=body, headers=headers)
+    assert response.status_code == 200
+    assert 'Idempotent-Replayed' not in response.headers
+
+def test_in_progress_key_conflicts(app, client):
+    """Test a duplicate of a request still running is refused"""
+    body = json.dumps(VOUCHER).encode()
+    app.extensions['idempotency'].claim('api.issue_voucher:payroll-5', hashlib.sha256(body).hexdigest())
+    response = client.post(
+        '/api/v1/vouchers/issue', data=body, content_type='application/json',
+        headers={'Idempotency-Key': 'payroll-5'}
+    )
+    assert response.status_code == 409
+    assert response.headers['Retry-After'] == '1'
+
+def test_memory_store_evicts_least_recently_used():
+    """Test the in-process store stays bounded and keeps recently used keys"""
+    store = MemoryIdempotencyStore(ttl=60, maxsize=2)
+    for key in ('a', 'b'):
+        store.claim(key, key)
+        store.complete(key, IdempotentResponse(key, 200, b'{}', 'application/json'))
+    assert store.claim('a', 'a').status_code == 200
+    assert store.claim('c', 'c') is None
+    assert store.claim('b', 'b') is None
+    assert store.claim('a', 'a') is None
+
+def test_memory_store_expires_keys(monkeypatch):
+    """Test stored responses are dropped after the TTL"""
+    clock = [1000.0]
+    monkeypatch.setattr('src.infrastructure.idempotency.time.monotonic', lambda: clock[0])
+    store = MemoryIdempotencyStore(ttl=10)
+    store.claim('a', 'a')
+    store.complete('a', IdempotentResponse('a', 200, b'{}', 'application/json'))
+    clock[0] += 11
+    assert store.claim('a', 'a') is None
+
+def test_database_store_claims_once(app):
+    """Test two claims on one key in the table store only let the first through"""
+    store = DatabaseIdempotencyStore(ttl=60)
+    assert store.claim('k', 'f') is None
+    assert store.claim('k', 'f') == IdempotentResponse('f')
+    store.release('k')
+    assert store.claim('k', 'f') is None
+
+def test_fast_paths_are_covered(monkeypatch, mocker):
+    """Test replays also apply when FAST_SERIALIZATION swaps the view"""
+    monkeypatch.setenv('FAST_SERIALIZATION', '1')
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(Decimal('108.57'), datetime(date.today().year, 1, 1)))
+        validate = mocker.spy(routes.voucher_service, 'validate_voucher')
+        client = app.test_client()
+        headers = {'Idempotency-Key': 'payroll-6'}
+        first = client.post('/api/v1/vouchers/validate', json=VOUCHER, headers=headers)
+        second = client.post('/api/v1/vouchers/validate', json=VOUCHER, headers=headers)
+        assert second.get_data() == first.get_data()
+        assert validate.call_count == 1
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
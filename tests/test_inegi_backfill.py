@@ -0,0 +1,96 @@
+import os
+import pytest
+import requests
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import (
+    CachedUMARepository,
+    UMARepository,
+    uma_cache
+)
+from src.infrastructure.services.inegi_service import INEGIService
+
+OBSERVATIONS = [
+    {"TIME_PERIOD": "2023/02", "OBS_VALUE": "103.74"},
+    {"TIME_PERIOD": "2024/02", "OBS_VALUE": "108.57"},
+    {"TIME_PERIOD": "2022/02", "OBS_VALUE": "96.22"},
+    {"TIME_PERIOD": "2021/02", "OBS_VALUE": ""},
+]
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def inegi_service(monkeypatch, mocker):
+    monkeypatch.setenv('INEGI_API_KEY', 'test-key')
+    mock_response = Mock()
+    mock_response.json.return_value = {"Series": [{"OBSERVATIONS": OBSERVATIONS}]}
+    mocker.patch.object(requests.Session, 'get', return_value=mock_response)
+    return INEGIService(CachedUMARepository())
+
+def test_backfill_inserts_every_period(inegi_service, app):
+    """Test every valid observation is stored from one response"""
+    with app.app_context():
+        assert inegi_service.backfill_uma_values() == (3, 3)
+        assert [(v.valid_from, v.daily_value) for v in UMARepository().get_all_values()] == [
+            (date(2022, 2, 1), Decimal('96.22')),
+            (date(2023, 2, 1), Decimal('103.74')),
+            (date(2024, 2, 1), Decimal('108.57')),
+        ]
+        assert requests.Session.get.call_count == 1
+
+def test_backfill_skips_stored_periods(inegi_service, app):
+    """Test periods already in uma_values are left untouched"""
+    with app.app_context():
+        UMARepository().save(UMAValue(Decimal('103.74'), date(2023, 2, 1)))
+        assert inegi_service.backfill_uma_values() == (3, 2)
+        assert inegi_service.backfill_uma_values() == (3, 0)
+        assert len(UMARepository().get_all_values()) == 3
+
+def test_backfill_invalidates_cache(inegi_service, app):
+    """Test cached reads see backfilled values"""
+    with app.app_context():
+        repository = CachedUMARepository()
+        assert repository.get_current_value() is None
+        inegi_service.backfill_uma_values()
+        assert repository.get_current_value().daily_value == Decimal('108.57')
+
+def test_update_uma_value_is_idempotent(inegi_service, app):
+    """Test updating twice stores the latest period once"""
+    with app.app_context():
+        assert inegi_service.update_uma_value().valid_from.year == 2024
+        assert inegi_service.update_uma_value() is not None
+        assert len(UMARepository().get_all_values()) == 1
+
+def test_update_uma_value_returns_domain_types(inegi_service, app):
+    """Test the stored and returned value use Decimal and date like the backfill"""
+    with app.app_context():
+        uma_value = inegi_service.update_uma_value()
+        assert uma_value.daily_value == Decimal('108.57')
+        assert type(uma_value.valid_from) is date
+        assert uma_value.limits.monthly_uma == Decimal('108.57') * Decimal('30.4')
+
+def test_backfill_uma_command(inegi_service, app):
+    """Test the backfill-uma command reports inserted and skipped periods"""
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=['backfill-uma'])
+        assert result.exit_code == 0
+        assert "Backfilled 3 UMA value(s), 0 already stored" in result.output
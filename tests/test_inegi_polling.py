@@ -0,0 +1,146 @@
+import json as jsonlib
+import os
+import pytest
+import threading
+from datetime import date
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import (
+    CachedUMARepository,
+    UMARepository,
+    uma_cache
+)
+from src.infrastructure.services.inegi_service import INEGIService
+
+class StubINEGI(BaseHTTPRequestHandler):
+    """Local stand-in for INEGI's BIE endpoint"""
+    observations = []
+    etag = None
+    requests = []
+
+    def do_GET(self):
+        StubINEGI.requests.append(dict(self.headers))
+        if self.etag and self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = jsonlib.dumps({"Series": [{"OBSERVATIONS": self.observations}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.etag:
+            self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub():
+    StubINEGI.observations = [{"TIME_PERIOD": "2024/02", "OBS_VALUE": "108.57"}]
+    StubINEGI.etag = '"v1"'
+    StubINEGI.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubINEGI)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def make_service(stub, tmp_path, monkeypatch):
+    monkeypatch.setenv('INEGI_API_KEY', 'test-key')
+
+    def make():
+        service = INEGIService(CachedUMARepository(), cache_path=str(tmp_path / 'inegi.json'))
+        service.BASE_URL = stub
+        return service
+    return make
+
+def test_first_poll_writes_cache(make_service, app, tmp_path):
+    """Test a fresh poll stores the value and the response validators"""
+    with app.app_context():
+        result = make_service().update_uma_value()
+        assert result.daily_value == Decimal('108.57')
+
+        with open(tmp_path / 'inegi.json') as f:
+            cache = jsonlib.load(f)
+        assert cache['etag'] == '"v1"'
+        assert len(cache['sha256']) == 64
+        assert 'OBSERVATIONS' in cache['body']
+
+def test_not_modified_skips_parsing_and_writes(make_service, app, mocker):
+    """Test a 304 from INEGI skips parsing and database writes"""
+    with app.app_context():
+        make_service().update_uma_value()
+        save = mocker.spy(UMARepository, 'save_many')
+        parse = mocker.spy(INEGIService, '_parse_observation')
+
+        service = make_service()
+        assert service.update_uma_value() is None
+        assert service.not_modified is True
+        assert StubINEGI.requests[-1]['If-None-Match'] == '"v1"'
+        assert save.call_count == 0
+        assert parse.call_count == 0
+
+def test_unchanged_payload_without_etag(make_service, app, mocker):
+    """Test an identical payload is detected by hash when INEGI sends no ETag"""
+    StubINEGI.etag = None
+    with app.app_context():
+        make_service().update_uma_value()
+        save = mocker.spy(UMARepository, 'save_many')
+
+        service = make_service()
+        assert service.update_uma_value() is None
+        assert service.not_modified is True
+        assert save.call_count == 0
+
+def test_changed_series_is_applied(make_service, app):
+    """Test a new observation is fetched and stored after the series changes"""
+    with app.app_context():
+        make_service().update_uma_value()
+        StubINEGI.observations = StubINEGI.observations + [
+            {"TIME_PERIOD": "2025/02", "OBS_VALUE": "113.14"}
+        ]
+        StubINEGI.etag = '"v2"'
+
+        service = make_service()
+        assert service.update_uma_value().daily_value == Decimal('113.14')
+        assert service.not_modified is False
+        assert UMARepository().get_current_value().valid_from == date(2025, 2, 1)
+
+def test_force_ignores_cache(make_service, app):
+    """Test --force style updates always refetch the full series"""
+    with app.app_context():
+        make_service().update_uma_value()
+        assert make_service().update_uma_value(force=True) is not None
+        assert 'If-None-Match' not in StubINEGI.requests[-1]
+
+def test_update_uma_command_unchanged(make_service, app, stub, monkeypatch, tmp_path):
+    """Test the command reports an unchanged series"""
+    monkeypatch.setattr(INEGIService, 'BASE_URL', stub)
+    monkeypatch.setenv('INEGI_CACHE_PATH', str(tmp_path / 'inegi.json'))
+    with app.app_context():
+        runner = app.test_cli_runner()
+        assert "Successfully updated" in runner.invoke(args=['update-uma']).output
+        assert "UMA value unchanged since last check" in runner.invoke(args=['update-uma']).output
@@ -0,0 +1,113 @@
+import os
+import pytest
+import requests
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.database import db
+from src.infrastructure.metrics import CallbackMetric, Counter, Histogram, Registry
+from src.infrastructure.repositories.uma_repository import (
+    CachedUMARepository,
+    UMARepository,
+    uma_cache
+)
+from src.infrastructure.services.inegi_service import INEGIService
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 1, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def sample(text, line_prefix):
+    """Return the value of the first exposition line starting with line_prefix"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram buckets, sum and count in the text format"""
+    registry = Registry()
+    histogram = Histogram('latency_seconds', 'Latency', ['route'], buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.labels('/a').observe(value)
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{route="/a"} 2.65' in text
+    assert 'latency_seconds_count{route="/a"} 4' in text
+
+def test_counter_labels():
+    """Test counters are tracked per label set and checked for arity"""
+    registry = Registry()
+    counter = Counter('fetches', 'Fetches', ['outcome'], registry=registry)
+    counter.labels('ok').inc()
+    counter.labels('ok').inc(2)
+    counter.labels('error').inc()
+
+    text = registry.render()
+    assert 'fetches_total{outcome="ok"} 3' in text
+    assert 'fetches_total{outcome="error"} 1' in text
+    with pytest.raises(ValueError):
+        counter.labels('ok', 'extra')
+
+def test_callback_metric_has_no_labels():
+    """Test callback metrics render their callback's samples and have no children"""
+    registry = Registry()
+    gauge = CallbackMetric('pool_size', 'Pool size', 'gauge', lambda: [({}, 5)], registry=registry)
+    assert 'pool_size 5' in registry.render()
+    assert not hasattr(gauge, 'labels')
+
+def test_metrics_endpoint_reports_routes_queries_and_cache(client):
+    """Test /metrics covers request latency, repository queries and the UMA cache"""
+    route = 'http_request_duration_seconds_count{route="/api/v1/vouchers/validate",method="POST",status="200"}'
+    query = 'db_query_duration_seconds_count{repository_method="UMARepository.get_current_value"}'
+    before = client.get('/metrics').get_data(as_text=True)
+
+    for _ in range(3):
+        client.post('/api/v1/vouchers/validate', json={'amount': 100})
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert sample(text, route) - (sample(before, route) or 0) == 3
+    # Only the first lookup misses the cache and queries the database
+    assert sample(text, query) - (sample(before, query) or 0) == 1
+    assert sample(text, 'uma_cache_hits_total') >= 2
+    assert 'uma_cache_hit_ratio' in text
+
+def test_inegi_fetch_outcome_recorded(app, monkeypatch, mocker):
+    """Test INEGI fetches are timed by outcome"""
+    monkeypatch.setenv('INEGI_API_KEY', 'test-key')
+    mocker.patch.object(requests.Session, 'get', return_value=Mock(status_code=304))
+    line = 'inegi_fetch_duration_seconds_count{outcome="not_modified"}'
+    before = app.test_client().get('/metrics').get_data(as_text=True)
+
+    INEGIService(CachedUMARepository()).update_uma_value()
+
+    text = app.test_client().get('/metrics').get_data(as_text=True)
+    assert sample(text, line) - (sample(before, line) or 0) == 1
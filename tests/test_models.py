@@ -0,0 +1,42 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from src.domain.exceptions import LimitExceededError
+from src.domain.models import LimitsSnapshot, UMAValue, VoucherLimits
+
+def test_voucher_limits_values():
+    """Test limits are derived from the daily UMA value"""
+    limits = VoucherLimits(Decimal('108.57'))
+    assert limits.monthly_uma == Decimal('3300.528')
+    assert limits.max_monthly_amount == limits.monthly_uma
+    assert limits.annual_max_deposits == 7
+    assert limits.max_annual_amount == Decimal('23103.696')
+
+def test_voucher_limits_memoized():
+    """Test limits are computed once per daily UMA value"""
+    assert VoucherLimits(Decimal('108.57')) is VoucherLimits(Decimal('108.57'))
+    assert VoucherLimits(Decimal('108.57')) is not VoucherLimits(Decimal('113.14'))
+
+def test_voucher_limits_immutable():
+    """Test shared limits cannot be modified"""
+    limits = VoucherLimits(Decimal('108.57'))
+    with pytest.raises(AttributeError):
+        limits.monthly_uma = Decimal('0')
+    with pytest.raises(AttributeError):
+        limits.extra = 1
+
+def test_uma_value_limits():
+    """Test UMA values expose the limits for their period"""
+    uma = UMAValue(Decimal('108.57'), date(2024, 2, 1))
+    assert uma.limits is VoucherLimits(Decimal('108.57'))
+
+def test_limits_snapshot_checks():
+    """Test a snapshot checks monthly and remaining annual limits from one load"""
+    snapshot = LimitsSnapshot(UMAValue(Decimal('108.57'), date(2024, 2, 1)), 2024, Decimal('22000.00'))
+    assert snapshot.remaining == Decimal('1103.696')
+    snapshot.check(Decimal('1000.00'))
+    with pytest.raises(LimitExceededError, match='annual'):
+        snapshot.check(Decimal('1200.00'))
+    with pytest.raises(LimitExceededError, match='monthly'):
+        snapshot.check(Decimal('3400.00'))
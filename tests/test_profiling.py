@@ -0,0 +1,76 @@
+import cProfile
+import os
+import pytest
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.database import db
+from src.infrastructure.profiling import ProfileRing
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+
+@pytest.fixture
+def profiled_app(monkeypatch, tmp_path):
+    """Create an application with header-triggered profiling."""
+    monkeypatch.setenv('PROFILE_TOKEN', 'secret')
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path))
+    monkeypatch.delenv('PROFILE_SAMPLE_RATE', raising=False)
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 1, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+def test_no_hooks_when_disabled(monkeypatch):
+    """Test profiling registers nothing unless it is configured"""
+    monkeypatch.delenv('PROFILE_TOKEN', raising=False)
+    monkeypatch.delenv('PROFILE_SAMPLE_RATE', raising=False)
+    app = create_app(create_tables=False)
+    hooks = [func.__name__ for funcs in app.before_request_funcs.values() for func in funcs]
+    assert 'start_profile' not in hooks
+
+def test_profile_recorded_with_token(profiled_app, tmp_path):
+    """Test a request carrying the token is profiled into the ring buffer"""
+    client = profiled_app.test_client()
+    response = client.post('/api/v1/vouchers/validate', json={'amount': 100},
+                           headers={'X-Profile': 'secret'})
+    assert response.status_code == 200
+    assert os.listdir(tmp_path) == [response.headers['X-Profile-Id']]
+    assert response.headers['X-Profile-Id'].endswith('-api.validate_voucher.prof')
+
+    client.post('/api/v1/vouchers/validate', json={'amount': 100})
+    client.post('/api/v1/vouchers/validate', json={'amount': 100}, headers={'X-Profile': 'wrong'})
+    assert len(os.listdir(tmp_path)) == 1
+
+def test_ring_keeps_newest_profiles(tmp_path):
+    """Test the buffer drops the oldest profiles past max_files"""
+    ring = ProfileRing(str(tmp_path), max_files=3)
+    names = []
+    for _ in range(5):
+        profile = cProfile.Profile()
+        profile.enable()
+        sum(range(100))
+        profile.disable()
+        names.append(ring.write(profile, 'api.validate_voucher'))
+    assert [os.path.basename(path) for path in ring.files()] == names[-3:]
+
+def test_profile_top_command(profiled_app):
+    """Test the CLI merges stored profiles into a hotspot report"""
+    client = profiled_app.test_client()
+    for _ in range(2):
+        client.post('/api/v1/vouchers/validate', json={'amount': 100}, headers={'X-Profile': 'secret'})
+
+    result = profiled_app.test_cli_runner().invoke(
+        args=['profile-top', '--limit', '50', '--endpoint', 'api.validate_voucher']
+    )
+    assert "Merged 2 profile(s)" in result.output
+    assert 'validate_voucher' in result.output
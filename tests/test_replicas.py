@@ -0,0 +1,142 @@
+import os
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue, VoucherTransaction
+from src.infrastructure.database import db
+from src.infrastructure.pool import engine_options_from_env
+from src.infrastructure.replicas import ReplicaRouter, replica_binds_from_env, replica_reads
+from src.infrastructure.repositories.transaction_repository import AnnualTotalModel, TransactionRepository
+from src.infrastructure.repositories.uma_repository import CachedUMARepository, UMARepository, uma_cache
+
+YEAR = date.today().year
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Create an application whose replica is a separate SQLite file."""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setenv('DATABASE_REPLICA_URLS', f"sqlite:///{tmp_path / 'replica.db'}")
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica_0'])
+        uma_cache.invalidate()
+        # Different values on each side show which one answered
+        UMARepository().save(UMAValue(Decimal('108.57'), datetime(YEAR, 1, 1)))
+        with db.engines['replica_0'].begin() as connection:
+            connection.execute(db.metadatas[None].tables['uma_values'].insert().values(
+                daily_value=Decimal('100.00'), valid_from=date(YEAR, 1, 1), created_at=datetime.utcnow()
+            ))
+        db.session.remove()
+        app.extensions['replicas'].check(db.engines)
+        yield app
+        db.session.remove()
+    app.extensions['replicas'].stop(timeout=5)
+    uma_cache.invalidate()
+
+def test_reads_go_to_the_replica(app):
+    """Test repository reads are served by the replica"""
+    assert UMARepository().get_value_at(date(YEAR, 6, 1)).daily_value == Decimal('100.00')
+    assert app.extensions['replicas'].lags() == {'replica_0': 0.0}
+
+def test_writes_pin_the_session_to_the_primary(app):
+    """Test reads after a write in the same session see the primary"""
+    repository = TransactionRepository()
+    repository.save(VoucherTransaction(Decimal('10.00'), date(YEAR, 3, 1), 'EMP1'))
+    assert repository.get_annual_total(YEAR, 'EMP1') == Decimal('10.00')
+    assert UMARepository().get_value_at(date(YEAR, 6, 1)).daily_value == Decimal('108.57')
+
+def test_pin_ends_with_the_session(app):
+    """Test a new session goes back to the replica"""
+    TransactionRepository().save(VoucherTransaction(Decimal('10.00'), date(YEAR, 3, 1), 'EMP1'))
+    db.session.remove()
+    assert TransactionRepository().get_annual_total(YEAR, 'EMP1') == Decimal('0')
+
+def test_unmarked_reads_use_the_primary(app):
+    """Test queries outside replica_reads() stay on the primary"""
+    assert db.session.query(AnnualTotalModel).count() == 0
+    TransactionRepository().save(VoucherTransaction(Decimal('10.00'), date(YEAR, 3, 1), 'EMP1'))
+    db.session.remove()
+    assert db.session.query(AnnualTotalModel).count() == 1
+    with replica_reads():
+        assert db.session.query(AnnualTotalModel).count() == 0
+
+def test_lagging_replica_falls_back_to_the_primary(app, monkeypatch):
+    """Test a replica beyond DB_REPLICA_MAX_LAG is skipped"""
+    monkeypatch.setattr(ReplicaRouter, 'measure', lambda self, key, engine: 60.0)
+    app.extensions['replicas'].check(db.engines)
+    assert UMARepository().get_value_at(date(YEAR, 6, 1)).daily_value == Decimal('108.57')
+
+def test_uma_cache_is_filled_from_the_primary(app):
+    """Test the cached UMA and the cache fingerprint never come from a lagging replica"""
+    assert CachedUMARepository().get_current_value().daily_value == Decimal('108.57')
+    assert CachedUMARepository().get_value_at(date(YEAR, 6, 1)).daily_value == Decimal('108.57')
+    assert UMARepository().get_fingerprint() == (1, date(YEAR, 1, 1))
+
+def test_get_remaining_reads_the_replica(app):
+    """Test the read-only endpoint is served by the replica"""
+    TransactionRepository().save(VoucherTransaction(Decimal('10.00'), date(YEAR, 3, 1), 'EMP1'))
+    db.session.remove()
+    response = app.test_client().get(f'/api/v1/vouchers/remaining?year={YEAR}&employee_id=EMP1')
+    assert response.status_code == 200
+    # The UMA comes from the primary through the cache; the replica doesn't have the voucher
+    assert response.get_json()['annual_limit'] == float(Decimal('108.57') * Decimal('30.4') * 7)
+    assert response.get_json()['remaining_limit'] == response.get_json()['annual_limit']
+
+class FakeConnection:
+    """Connection whose lag query returns a fixed value"""
+    lag = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        assert 'pg_stat_wal_receiver' in str(statement)
+        return type('Result', (), {'scalar': lambda result: self.lag})()
+
+def fake_engine(lag):
+    connection = type('Connection', (FakeConnection,), {'lag': lag})
+    return type('Engine', (), {'dialect': type('Dialect', (), {'name': 'postgresql'})(), 'connect': connection})()
+
+def test_choose_only_reads_measured_lags():
+    """Test choosing a replica never runs a lag query, and unmeasured replicas are skipped"""
+    router = ReplicaRouter(['replica_0'], max_lag=5)
+    engine = fake_engine(1.0)
+    engine.connect = None
+    assert router.choose({'replica_0': engine}) is None
+
+    router.check({'replica_0': fake_engine(1.0)})
+    assert router.choose({'replica_0': engine}) is engine
+
+def test_router_skips_a_replica_that_is_not_streaming():
+    """Test a replica whose lag query reports no WAL receiver is never chosen"""
+    router = ReplicaRouter(['replica_0'], max_lag=5)
+    engine = fake_engine(float('inf'))
+    router.check({'replica_0': engine})
+    assert router.choose({'replica_0': engine}) is None
+    assert router.lags() == {'replica_0': float('inf')}
+
+def test_lag_is_checked_in_the_background(app):
+    """Test the first request starts the lag thread, which keeps measuring"""
+    router = app.extensions['replicas']
+    app.test_client().get('/api/v1/uma')
+    thread = router._thread
+    assert thread.is_alive()
+    router.stop(timeout=5)
+    assert not thread.is_alive()
+
+def test_replica_connect_timeout(monkeypatch):
+    """Test PostgreSQL replicas get a short connect timeout alongside the pool options"""
+    monkeypatch.setenv('DATABASE_REPLICA_URLS', 'postgresql://replica/db')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+    binds = replica_binds_from_env(engine_options_from_env)
+    assert binds['replica_0']['connect_args'] == {'options': '-c statement_timeout=5000', 'connect_timeout': 2}
@@ -0,0 +1,117 @@
+import json
+import os
+import pytest
+import random
+from decimal import ROUND_HALF_EVEN, Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+pytest.importorskip('numpy')
+
+from src.app import create_app
+from src.application.simulator import round_half_even, simulate
+from src.domain.models import VoucherLimits
+from src.interfaces.cli.commands import simulate_limits_command
+
+CENT = Decimal('0.01')
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+def test_caps_match_decimal_limits():
+    """Test rounded caps agree with VoucherLimits for many daily values"""
+    rng = random.Random(7)
+    daily_values = [rng.randint(1, 5_000_000) / 100 for _ in range(2000)]
+    result = simulate(daily_values, [('EMP1', [1.0])])
+
+    for i, daily_value in enumerate(daily_values):
+        limits = VoucherLimits(Decimal(str(daily_value)))
+        assert result['monthly_cap'][i] == float(limits.monthly_uma.quantize(CENT, ROUND_HALF_EVEN))
+        assert result['annual_cap'][i] == float(limits.max_annual_amount.quantize(CENT, ROUND_HALF_EVEN))
+
+def test_round_half_even():
+    """Test ties round to the even cent"""
+    import numpy as np
+    assert round_half_even(np.array([5, 15, 25, 24, 26, -5, -15])).tolist() == [0, 2, 2, 2, 3, 0, -2]
+
+def test_breach_points():
+    """Test the first monthly and annual breaches match LimitsSnapshot.check"""
+    # 103.74 daily: monthly cap 3153.696, annual cap 22075.872
+    plans = [
+        ('EMP1', [3000.00] * 8),
+        ('EMP2', [1000.00, 3153.70, 100.00]),
+        ('EMP3', [3153.69] * 7)
+    ]
+    result = simulate([103.74, 200.00], plans)
+
+    emp1, emp2, emp3 = result['plans']
+    assert emp1['annual_breach'] == [8, None]
+    assert emp1['monthly_breach'] == [None, None]
+    assert emp2['monthly_breach'] == [2, None]
+    assert emp2['annual_breach'] == [None, None]
+    assert emp3['monthly_breach'] == [None, None]
+    assert emp3['annual_breach'] == [None, None]
+    assert emp3['total'] == 22075.83
+    assert emp3['remaining'][0] == 0.04
+    assert emp1['remaining'][0] == float((Decimal('22075.872') - 24000).quantize(CENT, ROUND_HALF_EVEN))
+
+def test_invalid_values():
+    """Test amounts with more than two decimals or non-positive values are rejected"""
+    with pytest.raises(ValueError):
+        simulate([103.745], [('EMP1', [1.0])])
+    with pytest.raises(ValueError):
+        simulate([103.74], [('EMP1', [0])])
+    with pytest.raises(ValueError):
+        simulate('103.74', [('EMP1', [1.0])])
+    with pytest.raises(ValueError):
+        simulate([1e300], [('EMP1', [1.0])])
+    with pytest.raises(ValueError):
+        simulate([103.74], [('EMP1', [100000000.0])])
+
+def test_simulate_endpoint(app):
+    """Test the endpoint returns columnar results"""
+    client = app.test_client()
+    response = client.post('/api/v1/vouchers/simulate', json={
+        'daily_values': [103.74, 108.57],
+        'deposit_plans': [{'employee_id': 'EMP1', 'deposits': [3000.0] * 8}]
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['daily_value'] == [103.74, 108.57]
+    assert data['monthly_cap'] == [3153.7, 3300.53]
+    assert data['plans'][0]['employee_id'] == 'EMP1'
+    assert data['plans'][0]['annual_breach'] == [8, 8]
+
+def test_simulate_endpoint_rejects_bad_values(app):
+    """Test invalid scenarios are a 400"""
+    client = app.test_client()
+    response = client.post('/api/v1/vouchers/simulate', json={
+        'daily_values': [-1],
+        'deposit_plans': [{'employee_id': 'EMP1', 'deposits': [1.0]}]
+    })
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_simulate_endpoint_rejects_scalar_daily_values(app):
+    """Test a bare number instead of a list is a 400, not a server error"""
+    response = app.test_client().post('/api/v1/vouchers/simulate', json={
+        'daily_values': 103.74,
+        'deposit_plans': [{'employee_id': 'EMP1', 'deposits': [1.0]}]
+    })
+    assert response.status_code == 400
+
+def test_simulate_command(app, tmp_path):
+    """Test the CLI reads a request body from a file and writes JSON"""
+    spec = tmp_path / 'spec.json'
+    spec.write_text(json.dumps({
+        'daily_values': [103.74],
+        'deposit_plans': [{'employee_id': 'EMP1', 'deposits': [5000.0]}]
+    }))
+    result = app.test_cli_runner().invoke(simulate_limits_command, [str(spec)])
+    assert result.exit_code == 0, result.output
+    output = json.loads(result.stdout)
+    assert output['plans'][0]['monthly_breach'] == [1]
@@ -0,0 +1,111 @@
+import json
+import os
+import pytest
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.application.transaction_import import detect_format, import_transactions, parse_row
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import (
+    TransactionModel,
+    TransactionRepository
+)
+
+CSV_ROWS = """amount,transaction_date,employee_id
+1000.00,2023-03-01,EMP1
+250.5,2023-12-31,EMP1
+-5,2023-04-01,EMP1
+1.001,2023-04-01,EMP2
+99.99,2024-01-01,EMP1
+300,not-a-date,EMP2
+400,2024-06-30,
+"""
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def repository():
+    return TransactionRepository()
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / 'vouchers.csv'
+    path.write_text(CSV_ROWS)
+    return str(path)
+
+def test_import_csv(app, repository, csv_file):
+    """Test valid rows are written in chunks and invalid ones reported by line"""
+    result = import_transactions(csv_file, repository, chunk_size=2)
+
+    assert result.imported == 4
+    assert result.skipped == 3
+    assert [line for line, _ in result.errors] == [4, 5, 7]
+    assert db.session.query(TransactionModel).count() == 4
+    assert repository.get_annual_total(2023, 'EMP1') == Decimal('1250.50')
+    assert repository.get_annual_total(2024, 'EMP1') == Decimal('99.99')
+    assert repository.get_annual_total(2024) == Decimal('400.00')
+    assert repository.reconcile_annual_totals(dry_run=True) == []
+
+def test_import_writes_one_chunk_at_a_time(app, repository, csv_file, mocker):
+    """Test rows are handed to the repository in chunks of chunk_size"""
+    bulk_insert = mocker.spy(repository, 'bulk_insert')
+    import_transactions(csv_file, repository, chunk_size=3)
+    assert [len(call.args[0]) for call in bulk_insert.call_args_list] == [2, 1, 1]
+
+def test_import_jsonl(app, repository, tmp_path):
+    """Test JSON-lines input keeps exact decimal amounts"""
+    path = tmp_path / 'vouchers.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'amount': 0.1, 'transaction_date': '2024-02-01', 'employee_id': 'EMP1'}),
+        json.dumps({'amount': 0.2, 'transaction_date': '2024-02-02', 'employee_id': 'EMP1'}),
+        '{"amount": ',
+        ''
+    ]))
+    result = import_transactions(str(path), repository)
+
+    assert result.imported == 2
+    assert result.errors[0][0] == 3
+    assert repository.get_annual_total(2024, 'EMP1') == Decimal('0.30')
+
+def test_import_dry_run(app, repository, csv_file):
+    """Test a dry run validates without writing"""
+    result = import_transactions(csv_file, repository, dry_run=True)
+    assert result.imported == 4
+    assert db.session.query(TransactionModel).count() == 0
+
+def test_parse_row_strips_employee_id_before_checking_it():
+    """Test padding does not count toward the length and a blank ID is rejected"""
+    row = {'amount': '10.00', 'transaction_date': '2024-01-01'}
+    assert parse_row({**row, 'employee_id': '  EMP1  '})['employee_id'] == 'EMP1'
+    assert parse_row({**row, 'employee_id': ' ' + 'E' * 64 + ' '})['employee_id'] == 'E' * 64
+    assert parse_row(row)['employee_id'] == ''
+    with pytest.raises(ValueError):
+        parse_row({**row, 'employee_id': '   '})
+    with pytest.raises(ValueError):
+        parse_row({**row, 'employee_id': 'E' * 65})
+
+def test_detect_format():
+    """Test the format is inferred from the extension"""
+    assert detect_format('vouchers.CSV') == 'csv'
+    assert detect_format('vouchers.ndjson') == 'jsonl'
+    with pytest.raises(ValueError):
+        detect_format('vouchers.xlsx')
+
+def test_import_transactions_command(app, csv_file):
+    """Test the CLI reports imported and skipped rows"""
+    result = app.test_cli_runner().invoke(args=['import-transactions', csv_file])
+    assert "line 4: Invalid amount '-5'" in result.output
+    assert "Imported 4 transaction(s), skipped 3 invalid row(s)" in result.output
+    assert TransactionRepository().get_annual_total(2023, 'EMP1') == Decimal('1250.50')
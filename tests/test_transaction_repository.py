@@ -0,0 +1,107 @@
+import os
+import pytest
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import VoucherTransaction
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import (
+    AnnualTotalModel,
+    TransactionModel,
+    TransactionRepository
+)
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def repository():
+    return TransactionRepository()
+
+def test_annual_total_year_boundaries(repository, app):
+    """Test the annual total includes Jan 1 and Dec 31 but not adjacent years"""
+    with app.app_context():
+        for amount, day in [
+            ('1.00', date(2023, 12, 31)),
+            ('10.00', date(2024, 1, 1)),
+            ('100.00', date(2024, 12, 31)),
+            ('1000.00', date(2025, 1, 1)),
+        ]:
+            repository.save(VoucherTransaction(Decimal(amount), day))
+
+        assert repository.get_annual_total(2024) == Decimal('110.00')
+        assert repository.get_annual_total(2023) == Decimal('1.00')
+
+def test_annual_total_empty_year(repository, app):
+    """Test a year without transactions totals zero"""
+    with app.app_context():
+        assert repository.get_annual_total(2024) == Decimal('0')
+
+def test_save_updates_annual_total(repository, app):
+    """Test saving a transaction increments its year's running total"""
+    with app.app_context():
+        repository.save(VoucherTransaction(Decimal('10.00'), date(2024, 3, 1)))
+        repository.save(VoucherTransaction(Decimal('2.50'), date(2024, 4, 1)))
+        assert db.session.get(AnnualTotalModel, ('', 2024)).total == Decimal('12.50')
+
+def test_reconcile_reports_and_fixes_drift(repository, app):
+    """Test reconciliation rebuilds totals from the ledger"""
+    with app.app_context():
+        repository.save(VoucherTransaction(Decimal('10.00'), date(2024, 3, 1)))
+        db.session.add(TransactionModel(amount=Decimal('5.00'), transaction_date=date(2024, 5, 1)))
+        db.session.add(AnnualTotalModel(year=2020, total=Decimal('7.00')))
+        db.session.commit()
+
+        assert repository.reconcile_annual_totals(dry_run=True) == [
+            ('', 2020, Decimal('7.00'), Decimal('0')),
+            ('', 2024, Decimal('10.00'), Decimal('15.00')),
+        ]
+        assert repository.get_annual_total(2024) == Decimal('10.00')
+
+        repository.reconcile_annual_totals()
+        assert repository.get_annual_total(2024) == Decimal('15.00')
+        assert repository.get_annual_total(2020) == Decimal('0')
+        assert repository.reconcile_annual_totals(dry_run=True) == []
+
+def test_reconcile_totals_command(repository, app):
+    """Test the reconcile-totals command reports drift"""
+    with app.app_context():
+        db.session.add(TransactionModel(amount=Decimal('5.00'), transaction_date=date(2024, 5, 1)))
+        db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['reconcile-totals', '--dry-run'])
+        assert result.exit_code == 0
+        assert "(unassigned) 2024: stored 0.00, ledger 5.00, drift 5.00" in result.output
+        assert "Found drift in 1 employee year(s)" in result.output
+
+        result = app.test_cli_runner().invoke(args=['reconcile-totals'])
+        assert "Rebuilt annual totals, corrected 1 employee year(s)" in result.output
+
+def test_annual_totals_are_per_employee(repository, app):
+    """Test each employee's transactions count only against their own total"""
+    with app.app_context():
+        repository.save(VoucherTransaction(Decimal('10.00'), date(2024, 3, 1), 'E-1'))
+        repository.save(VoucherTransaction(Decimal('20.00'), date(2024, 3, 1), 'E-2'))
+        repository.save(VoucherTransaction(Decimal('5.00'), date(2024, 4, 1), 'E-1'))
+
+        assert repository.get_annual_total(2024, 'E-1') == Decimal('15.00')
+        assert repository.get_annual_total(2024, 'E-2') == Decimal('20.00')
+        assert repository.get_annual_total(2024) == Decimal('0')
+        assert repository.get_ledger_total(2024, 'E-1') == Decimal('15.00')
+        assert repository.get_annual_totals(2024, ['E-1', 'E-2', 'E-3']) == {
+            'E-1': Decimal('15.00'),
+            'E-2': Decimal('20.00'),
+            'E-3': Decimal('0'),
+        }
@@ -0,0 +1,78 @@
+import os
+import pytest
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import CachedUMARepository, UMARepository
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def repository():
+    return CachedUMARepository(TTLCache(ttl=60))
+
+def test_ttl_cache_expires(mocker):
+    """Test entries are dropped once the TTL elapses"""
+    clock = mocker.patch('src.infrastructure.cache.time.monotonic', return_value=100.0)
+    cache = TTLCache(ttl=10)
+    cache.set('key', 'value')
+    assert cache.get('key') == (True, 'value')
+
+    clock.return_value = 111.0
+    assert cache.get('key') == (False, None)
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 0}
+
+def test_ttl_cache_evicts_oldest():
+    """Test the oldest entry is evicted when the cache is full"""
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+    assert cache.get('a') == (False, None)
+    assert cache.get('c') == (True, 3)
+
+def test_current_value_served_from_cache(repository, app, mocker):
+    """Test repeated reads hit the database once"""
+    with app.app_context():
+        UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 2, 1)))
+        query = mocker.spy(UMARepository, 'get_current_value')
+
+        first = repository.get_current_value()
+        second = repository.get_current_value()
+
+        assert first is second
+        assert query.call_count == 1
+        assert repository.cache.stats()['hits'] == 1
+        assert repository.cache.stats()['misses'] == 1
+
+def test_missing_value_not_cached(repository, app):
+    """Test an empty table is re-queried until a value exists"""
+    with app.app_context():
+        assert repository.get_current_value() is None
+        UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 2, 1)))
+        assert repository.get_current_value().daily_value == Decimal('108.57')
+
+def test_save_invalidates_cache(repository, app):
+    """Test writing a new UMA value invalidates cached reads"""
+    with app.app_context():
+        repository.save(UMAValue(Decimal('108.57'), date(2024, 2, 1)))
+        assert repository.get_current_value().daily_value == Decimal('108.57')
+
+        repository.save(UMAValue(Decimal('113.14'), date(2025, 2, 1)))
+        assert repository.get_current_value().daily_value == Decimal('113.14')
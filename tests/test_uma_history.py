@@ -0,0 +1,100 @@
+import os
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from flask import json
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue, VoucherLimits
+from src.infrastructure.cache import TTLCache
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import (
+    CachedUMARepository,
+    UMAIntervalIndex,
+    UMARepository,
+    uma_cache
+)
+
+UMA_2023 = Decimal('103.74')
+UMA_2024 = Decimal('108.57')
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(UMA_2023, date(2023, 2, 1)))
+        UMARepository().save(UMAValue(UMA_2024, date(2024, 2, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def test_interval_index_lookup():
+    """Test each date maps to the period that contains it"""
+    index = UMAIntervalIndex([
+        UMAValue(UMA_2024, date(2024, 2, 1)),
+        UMAValue(UMA_2023, date(2023, 2, 1)),
+    ])
+    assert index.lookup(date(2023, 1, 31)) is None
+    assert index.lookup(date(2023, 2, 1)).daily_value == UMA_2023
+    assert index.lookup(date(2024, 1, 31)).daily_value == UMA_2023
+    assert index.lookup(date(2024, 2, 1)).daily_value == UMA_2024
+    assert index.lookup(date(2030, 1, 1)).daily_value == UMA_2024
+
+def test_get_value_at_matches_database(app):
+    """Test the cached index agrees with the database query"""
+    with app.app_context():
+        cached = CachedUMARepository(TTLCache(ttl=60))
+        for day in [date(2022, 12, 31), date(2023, 2, 1), date(2024, 1, 15), date(2024, 6, 1)]:
+            expected = UMARepository().get_value_at(day)
+            actual = cached.get_value_at(day)
+            assert (actual and actual.daily_value) == (expected and expected.daily_value)
+        assert cached.get_value_at(datetime(2024, 1, 15, 12)).daily_value == UMA_2023
+
+def test_get_value_at_loads_index_once(app, mocker):
+    """Test lookups after the first one run no queries"""
+    with app.app_context():
+        cached = CachedUMARepository(TTLCache(ttl=60))
+        load = mocker.spy(UMARepository, 'get_all_values')
+        cached.get_value_at(date(2023, 6, 1))
+        cached.get_value_at(date(2024, 6, 1))
+        assert load.call_count == 1
+
+        cached.save(UMAValue(Decimal('113.14'), date(2025, 2, 1)))
+        assert cached.get_value_at(date(2025, 6, 1)).daily_value == Decimal('113.14')
+        assert load.call_count == 2
+
+def test_validate_uses_uma_at_transaction_date(client):
+    """Test a December voucher is checked against that December's UMA"""
+    limit_2023 = VoucherLimits(UMA_2023)
+    amount = float(limit_2023.monthly_uma) + 10
+
+    response = client.post('/api/v1/vouchers/validate',
+                           json={'amount': amount, 'transaction_date': '2023-12-15'})
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['limit'] == float(limit_2023.max_annual_amount)
+    assert 'exceeds monthly UMA limit' in data['message']
+
+    response = client.post('/api/v1/vouchers/validate', json={'amount': amount})
+    assert response.status_code == 200
+    assert json.loads(response.data)['limit'] == float(VoucherLimits(UMA_2024).max_annual_amount)
+
+def test_validate_before_first_uma(client):
+    """Test dates before any UMA period are reported as not found"""
+    response = client.post('/api/v1/vouchers/validate',
+                           json={'amount': 100.0, 'transaction_date': '2020-01-01'})
+    assert response.status_code == 404
+    assert 'No UMA value found' in json.loads(response.data)['error']
@@ -0,0 +1,73 @@
+import os
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import CachedUMARepository, uma_cache
+from src.interfaces.api import caching
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def max_age(response):
+    return int(response.headers['Cache-Control'].split('max-age=')[1])
+
+def test_uma_not_found_body(client):
+    """Test a missing UMA value returns the error body"""
+    response = client.get('/api/v1/uma')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'No UMA value found'}
+
+def test_uma_etag_and_not_modified(client):
+    """Test /uma sends a strong ETag and answers a matching If-None-Match with 304"""
+    CachedUMARepository().save(UMAValue(Decimal('108.57'), date.today() - timedelta(days=30)))
+    response = client.get('/api/v1/uma')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag.startswith('"') and not etag.startswith('W/')
+    assert client.get('/api/v1/uma').headers['ETag'] == etag
+
+    cached = client.get('/api/v1/uma', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    assert cached.headers['ETag'] == etag
+    assert client.get('/api/v1/uma', headers={'If-None-Match': '"stale"'}).status_code == 200
+
+    CachedUMARepository().save(UMAValue(Decimal('113.14'), date.today()))
+    changed = client.get('/api/v1/uma', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+def test_uma_max_age_until_expected_change(client, monkeypatch):
+    """Test max-age runs to the valid_from anniversary, capped by UMA_MAX_AGE"""
+    CachedUMARepository().save(UMAValue(Decimal('108.57'), date.today() - timedelta(days=364)))
+    assert 0 < max_age(client.get('/api/v1/uma')) <= 2 * 86400
+
+    monkeypatch.setattr(caching, 'UMA_MAX_AGE', 3600)
+    assert max_age(client.get('/api/v1/uma')) == 3600
+
+def test_uma_max_age_when_overdue(client):
+    """Test clients revalidate often once the next UMA value is overdue"""
+    CachedUMARepository().save(UMAValue(Decimal('108.57'), date.today() - timedelta(days=400)))
+    assert max_age(client.get('/api/v1/uma')) == caching.UMA_OVERDUE_MAX_AGE
@@ -0,0 +1,130 @@
+import os
+import pytest
+import requests
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue
+from src.infrastructure.database import db
+from src.infrastructure.repositories.uma_repository import (
+    CachedUMARepository,
+    UMARepository,
+    uma_cache
+)
+from src.infrastructure.services.uma_refresher import UMARefresher
+
+@pytest.fixture
+def app(monkeypatch):
+    """Create application for the tests."""
+    monkeypatch.setenv('INEGI_API_KEY', 'test-key')
+    monkeypatch.delenv('INEGI_CACHE_PATH', raising=False)
+    monkeypatch.delenv('UMA_REFRESH_INTERVAL', raising=False)
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+def inegi_returns(mocker, observations=None, error=None):
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"Series": [{"OBSERVATIONS": observations or []}]}
+    if error:
+        response.raise_for_status.side_effect = error
+    mocker.patch.object(requests.Session, 'get', return_value=response)
+
+def test_disabled_by_default(app):
+    """Test no refresher is configured without UMA_REFRESH_INTERVAL"""
+    assert UMARefresher.from_env(app) is None
+    assert 'uma_refresher' not in app.extensions
+
+def test_backoff_after_failures(app):
+    """Test failed refreshes back off exponentially up to the cap"""
+    refresher = UMARefresher(app, interval=600, jitter=0, retry=10, max_backoff=60)
+    assert refresher.next_delay() == 600
+    refresher.failures = 1
+    assert refresher.next_delay() == 10
+    refresher.failures = 3
+    assert refresher.next_delay() == 40
+    refresher.failures = 10
+    assert refresher.next_delay() == 60
+
+    refresher.jitter = 0.1
+    refresher.failures = 0
+    assert 540 <= refresher.next_delay() <= 660
+
+def test_tick_updates_and_refreshes_cache(app, mocker):
+    """Test a tick stores the new value and every worker's cache picks it up"""
+    UMARepository().save(UMAValue(Decimal('103.74'), date(2023, 2, 1)))
+    assert CachedUMARepository().get_current_value().daily_value == Decimal('103.74')
+
+    inegi_returns(mocker, [{"TIME_PERIOD": "2024/02", "OBS_VALUE": "108.57"}])
+    refresher = UMARefresher(app, interval=600)
+    refresher.tick()
+
+    assert refresher.failures == 0
+    assert CachedUMARepository().get_current_value().daily_value == Decimal('108.57')
+
+def test_sync_cache_sees_writes_from_other_replicas(app):
+    """Test a worker drops its cache when another process writes a value"""
+    refresher = UMARefresher(app, interval=600)
+    UMARepository().save(UMAValue(Decimal('103.74'), date(2023, 2, 1)))
+    refresher.sync_cache()
+    assert CachedUMARepository().get_current_value().daily_value == Decimal('103.74')
+
+    # Written without going through this worker's cached repository
+    UMARepository().save(UMAValue(Decimal('108.57'), date(2024, 2, 1)))
+    assert CachedUMARepository().get_current_value().daily_value == Decimal('103.74')
+    refresher.sync_cache()
+    assert CachedUMARepository().get_current_value().daily_value == Decimal('108.57')
+
+def test_one_fetch_per_interval_across_workers(app, mocker):
+    """Test a second worker ticking after the first skips INEGI but still syncs its cache"""
+    inegi_returns(mocker, [{"TIME_PERIOD": "2024/02", "OBS_VALUE": "108.57"}])
+    first = UMARefresher(app, interval=600)
+    second = UMARefresher(app, interval=600)
+
+    first.tick()
+    second.tick()
+    assert requests.Session.get.call_count == 1
+    assert second._fingerprint == first._fingerprint
+
+    # Once the interval has passed the next tick fetches again
+    UMARefresher(app, interval=0).tick()
+    assert requests.Session.get.call_count == 2
+
+def test_failed_fetch_counts_failures(app, mocker):
+    """Test INEGI errors are counted so the next tick backs off"""
+    inegi_returns(mocker, error=requests.HTTPError('503'))
+    refresher = UMARefresher(app, interval=600)
+    refresher.tick()
+    refresher.tick()
+    assert refresher.failures == 2
+
+def test_started_by_first_request(monkeypatch, tmp_path):
+    """Test the thread starts once, on the first request"""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'refresher.db'}")
+    monkeypatch.setenv('UMA_REFRESH_INTERVAL', '3600')
+    app = create_app()
+    refresher = app.extensions['uma_refresher']
+    assert refresher._thread is None
+
+    client = app.test_client()
+    client.get('/api/v1/uma')
+    thread = refresher._thread
+    client.get('/api/v1/uma')
+    try:
+        assert thread.is_alive()
+        assert refresher._thread is thread
+    finally:
+        refresher.stop(timeout=5)
+    assert not thread.is_alive()
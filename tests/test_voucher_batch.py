@@ -0,0 +1,95 @@
+import os
+import pytest
+from datetime import date
+from decimal import Decimal
+from flask import json
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue, VoucherLimits, VoucherTransaction
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+
+DAILY_UMA = Decimal('108.57')
+LIMITS = VoucherLimits(DAILY_UMA)
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(DAILY_UMA, date(2024, 1, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def test_validate_batch_results_in_order(client):
+    """Test one result is returned per voucher, in request order"""
+    response = client.post('/api/v1/vouchers/validate/batch', json={'vouchers': [
+        {'amount': 1000.0},
+        {'amount': -5.0},
+        {'amount': float(LIMITS.monthly_uma) + 100},
+    ]})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [r['is_valid'] for r in data['results']] == [True, False, False]
+    assert data['results'][0]['current_amount'] == 1000.0
+    assert 'Invalid amount' in data['results'][1]['message']
+    assert 'exceeds monthly UMA limit' in data['results'][2]['message']
+    assert data['valid_count'] == 1
+    assert data['invalid_count'] == 2
+
+def test_validate_batch_loads_totals_once_per_year(client, mocker):
+    """Test the annual totals are queried once per distinct year"""
+    totals = mocker.spy(TransactionRepository, 'get_annual_totals')
+    response = client.post('/api/v1/vouchers/validate/batch', json={'vouchers': [
+        {'amount': 100.0, 'transaction_date': '2024-03-01', 'employee_id': 'E-1'},
+        {'amount': 200.0, 'transaction_date': '2024-12-31', 'employee_id': 'E-2'},
+        {'amount': 300.0, 'transaction_date': '2023-06-15', 'employee_id': 'E-1'},
+    ]})
+    assert response.status_code == 200
+    assert sorted((call.args[1], sorted(call.args[2])) for call in totals.call_args_list) == [
+        (2023, ['E-1']),
+        (2024, ['E-1', 'E-2']),
+    ]
+
+def test_validate_batch_per_employee_remaining(client, app):
+    """Test each voucher is checked against its own employee's usage"""
+    with app.app_context():
+        TransactionRepository().save(
+            VoucherTransaction(LIMITS.max_annual_amount - 100, date.today(), 'E-1')
+        )
+    response = client.post('/api/v1/vouchers/validate/batch', json={'vouchers': [
+        {'amount': 200.0, 'employee_id': 'E-1'},
+        {'amount': 200.0, 'employee_id': 'E-2'},
+    ]})
+    data = json.loads(response.data)
+    assert [r['is_valid'] for r in data['results']] == [False, True]
+
+def test_validate_batch_exceeds_annual(client, mocker):
+    """Test vouchers over the remaining annual amount are rejected"""
+    mocker.patch.object(TransactionRepository, 'get_annual_totals',
+                        return_value={'': LIMITS.max_annual_amount - 100})
+    response = client.post('/api/v1/vouchers/validate/batch', json={'vouchers': [
+        {'amount': 50.0}, {'amount': 200.0},
+    ]})
+    data = json.loads(response.data)
+    assert [r['is_valid'] for r in data['results']] == [True, False]
+    assert 'exceed annual UMA limit' in data['results'][1]['message']
+
+def test_validate_batch_empty(client):
+    """Test an empty batch is rejected by the schema"""
+    response = client.post('/api/v1/vouchers/validate/batch', json={'vouchers': []})
+    assert response.status_code == 422
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+import os
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue, VoucherLimits, VoucherTransaction
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+from src.interfaces.api import export
+
+YEAR = 2023
+LIMIT = VoucherLimits(Decimal('103.74')).max_annual_amount
+
+@pytest.fixture
+def app():
+    """Create application for the tests."""
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(Decimal('103.74'), datetime(YEAR, 2, 1)))
+        repository = TransactionRepository()
+        for amount, day, employee_id in (
+            ('500.00', date(YEAR, 3, 1), 'EMP2'),
+            ('1000.00', date(YEAR, 1, 15), 'EMP1'),
+            ('250.50', date(YEAR, 6, 1), 'EMP1'),
+            ('99.00', date(YEAR + 1, 1, 2), 'EMP1')
+        ):
+            repository.save(VoucherTransaction(Decimal(amount), day, employee_id))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def test_export_csv(client):
+    """Test the CSV export has cumulative usage per employee for the year only"""
+    response = client.get(f'/api/v1/vouchers/export?year={YEAR}')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == f'attachment; filename=vouchers-{YEAR}.csv'
+    assert 'Content-Length' not in response.headers
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(row['employee_id'], row['transaction_date'], row['amount'], row['cumulative_amount'])
+            for row in rows] == [
+        ('EMP1', '2023-01-15', '1000.00', '1000.00'),
+        ('EMP1', '2023-06-01', '250.50', '1250.50'),
+        ('EMP2', '2023-03-01', '500.00', '500.00')
+    ]
+    assert rows[1]['annual_limit'] == f"{LIMIT:.2f}"
+    assert rows[1]['remaining'] == f"{LIMIT - Decimal('1250.50'):.2f}"
+    assert rows[1]['over_limit'] == 'false'
+
+def test_export_ndjson(client):
+    """Test the NDJSON export emits one object per voucher"""
+    response = client.get(f'/api/v1/vouchers/export?year={YEAR}&format=ndjson')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 3
+    assert lines[1] == {
+        'employee_id': 'EMP1',
+        'transaction_date': '2023-06-01',
+        'amount': 250.5,
+        'cumulative_amount': 1250.5,
+        'annual_limit': float(LIMIT),
+        'remaining': float(LIMIT - Decimal('1250.50')),
+        'over_limit': False
+    }
+
+def test_export_empty_year_has_header(client):
+    """Test a year without vouchers exports just the CSV header"""
+    response = client.get(f'/api/v1/vouchers/export?year={YEAR + 2}')
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).strip() == ','.join(export.COLUMNS)
+
+def test_export_rejects_unknown_format(client):
+    """Test an unsupported format is a 400"""
+    response = client.get(f'/api/v1/vouchers/export?year={YEAR}&format=xlsx')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_export_without_uma(app, client):
+    """Test a missing UMA is reported before streaming starts"""
+    db.session.execute(db.text('DELETE FROM uma_values'))
+    db.session.commit()
+    uma_cache.invalidate()
+    response = client.get(f'/api/v1/vouchers/export?year={YEAR}')
+    assert response.status_code == 404
+
+def test_export_chunks(monkeypatch):
+    """Test rows are encoded in bounded chunks"""
+    monkeypatch.setattr(export, 'CHUNK_ROWS', 2)
+    row = {
+        'employee_id': 'EMP1',
+        'transaction_date': date(YEAR, 1, 1),
+        'amount': Decimal('1.00'),
+        'cumulative_amount': Decimal('1.00'),
+        'annual_limit': LIMIT,
+        'remaining': LIMIT - 1,
+        'over_limit': False
+    }
+    chunks = list(export.csv_chunks([row] * 5))
+    assert len(chunks) == 3
+    assert chunks[0].count('\n') == 3
@@ -0,0 +1,155 @@
+import os
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from flask import json
+
+os.environ.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+
+from src.app import create_app
+from src.domain.models import UMAValue, VoucherLimits
+from src.infrastructure.database import db
+from src.infrastructure.repositories.transaction_repository import TransactionRepository
+from src.infrastructure.repositories.uma_repository import UMARepository, uma_cache
+
+DAILY_UMA = Decimal('108.57')
+LIMITS = VoucherLimits(DAILY_UMA)
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Create application backed by a SQLite file so threads share it."""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'vouchers.db'}")
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        uma_cache.invalidate()
+        UMARepository().save(UMAValue(DAILY_UMA, date(2024, 1, 1)))
+        yield app
+        db.session.remove()
+        db.drop_all()
+    uma_cache.invalidate()
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
+
+def test_issue_voucher_records_transaction(client, app):
+    """Test an accepted voucher is persisted and counted"""
+    response = client.post('/api/v1/vouchers/issue',
+                           json={'amount': 1000.0, 'transaction_date': '2024-05-01'})
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['is_valid'] is True
+    assert data['remaining'] == float(LIMITS.max_annual_amount - 1000)
+
+    with app.app_context():
+        assert TransactionRepository().get_ledger_total(2024) == Decimal('1000.00')
+
+def test_issue_voucher_rejects_over_annual_limit(client, app):
+    """Test a voucher past the annual limit is rejected and not recorded"""
+    monthly = float(LIMITS.monthly_uma.quantize(Decimal('0.01')) - Decimal('0.01'))
+    for _ in range(LIMITS.annual_max_deposits):
+        assert client.post('/api/v1/vouchers/issue',
+                           json={'amount': monthly, 'transaction_date': '2024-05-01'}).status_code == 201
+
+    response = client.post('/api/v1/vouchers/issue',
+                           json={'amount': monthly, 'transaction_date': '2024-06-01'})
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert 'exceed annual UMA limit' in data['message']
+
+    with app.app_context():
+        repository = TransactionRepository()
+        assert repository.get_annual_total(2024) == repository.get_ledger_total(2024)
+        assert repository.get_annual_total(2024) <= LIMITS.max_annual_amount
+
+def test_issue_voucher_invalid_amount(client):
+    """Test a non-positive amount is rejected"""
+    response = client.post('/api/v1/vouchers/issue', json={'amount': -1.0})
+    assert response.status_code == 400
+    assert 'Invalid amount' in json.loads(response.data)['message']
+
+def test_issue_voucher_contention(app):
+    """Contention benchmark: concurrent issues never overshoot the annual limit"""
+    amount = 500.0
+    attempts = 120
+    barrier = threading.Barrier(8)
+
+    def issue(_):
+        client = app.test_client()
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        return client.post('/api/v1/vouchers/issue',
+                           json={'amount': amount, 'transaction_date': '2024-07-01'}).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(issue, range(attempts)))
+
+    accepted = statuses.count(201)
+    assert statuses.count(400) == attempts - accepted
+    assert accepted == int(LIMITS.max_annual_amount // Decimal(str(amount)))
+
+    with app.app_context():
+        repository = TransactionRepository()
+        assert repository.get_annual_total(2024) == repository.get_ledger_total(2024)
+        assert repository.get_annual_total(2024) == Decimal(str(amount)) * accepted
+
+def test_remaining_limit_per_employee(client):
+    """Test issued vouchers reduce only the employee's own remaining limit"""
+    assert client.post('/api/v1/vouchers/issue', json={
+        'amount': 1000.0, 'transaction_date': '2024-05-01', 'employee_id': 'E-1'
+    }).status_code == 201
+
+    data = json.loads(client.get('/api/v1/vouchers/remaining?year=2024&employee_id=E-1').data)
+    assert data['employee_id'] == 'E-1'
+    assert data['remaining_limit'] == float(LIMITS.max_annual_amount - 1000)
+
+    data = json.loads(client.get('/api/v1/vouchers/remaining?year=2024&employee_id=E-2').data)
+    assert data['remaining_limit'] == float(LIMITS.max_annual_amount)
+
+def test_remaining_limit_past_year_uses_its_own_uma(client, app):
+    """Test a past year's annual and remaining limits both use the UMA at its close"""
+    with app.app_context():
+        UMARepository().save(UMAValue(Decimal('103.74'), date(2023, 1, 1)))
+    uma_cache.invalidate()
+
+    data = json.loads(client.get('/api/v1/vouchers/remaining?year=2023').data)
+    assert data['annual_limit'] == float(VoucherLimits(Decimal('103.74')).max_annual_amount)
+    assert data['remaining_limit'] == data['annual_limit']
+
+def test_validate_invalid_amount_without_uma(client):
+    """Test an invalid amount dated before every UMA is a 404, not a server error"""
+    response = client.post('/api/v1/vouchers/validate', json={'amount': -1.0, 'transaction_date': '2020-01-01'})
+    assert response.status_code == 404
+    assert 'error' in json.loads(response.data)
+
+def test_remaining_limit_without_uma(client, app):
+    """Test a missing UMA value is a 404, not a server error"""
+    response = client.get('/api/v1/vouchers/remaining?year=2020')
+    assert response.status_code == 404
+    assert 'error' in json.loads(response.data)
+
+def test_annual_cap_comes_from_the_year_not_the_transaction_date(client, app):
+    """Test a voucher dated before a mid-year UMA change uses that UMA monthly and the year's annually"""
+    with app.app_context():
+        UMARepository().save(UMAValue(Decimal('103.74'), date(2023, 1, 1)))
+        UMARepository().save(UMAValue(Decimal('110.00'), date(2023, 6, 1)))
+    uma_cache.invalidate()
+    annual = VoucherLimits(Decimal('110.00')).max_annual_amount
+    voucher = {'amount': 3153.70, 'employee_id': 'EMP1', 'transaction_date': '2023-03-01'}
+
+    # 3153.70 is over the monthly cap under 103.74 but not under 110.00
+    data = json.loads(client.post('/api/v1/vouchers/validate/batch', json={'vouchers': [voucher]}).data)
+    assert data['results'][0]['is_valid'] is False
+
+    response = client.post('/api/v1/vouchers/issue', json={**voucher, 'amount': 1000.0})
+    assert response.status_code == 201
+    data = json.loads(response.data)
+    assert data['remaining'] == float(annual - Decimal('1000.00'))
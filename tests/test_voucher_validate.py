@@ -0,0 +1,46 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+from src.application.services import VoucherService
+from src.domain.exceptions import UMANotFoundError
+from src.domain.models import UMAValue
+
+@pytest.fixture
+def repositories():
+    uma_repository = Mock()
+    uma_repository.get_current_value.return_value = UMAValue(Decimal('108.57'), date(2024, 2, 1))
+    transaction_repository = Mock()
+    transaction_repository.get_annual_total.return_value = Decimal('22000.00')
+    return uma_repository, transaction_repository
+
+@pytest.mark.parametrize('amount, is_valid', [(Decimal('1000.00'), True), (Decimal('1200.00'), False)])
+def test_validate_loads_limits_once(repositories, amount, is_valid):
+    """Test accepted and rejected vouchers read the UMA and annual total once each"""
+    uma_repository, transaction_repository = repositories
+    result = VoucherService(uma_repository, transaction_repository).validate_voucher(amount, 'EMP1')
+
+    assert result['is_valid'] is is_valid
+    assert result['limit'] == Decimal('23103.696')
+    assert result['remaining'] == Decimal('1103.696')
+    assert uma_repository.get_current_value.call_count == 1
+    transaction_repository.get_annual_total.assert_called_once_with(date.today().year, 'EMP1')
+
+def test_validate_invalid_amount_uses_the_snapshot(repositories):
+    """Test a non-positive amount is rejected with the same single read of limits and usage"""
+    uma_repository, transaction_repository = repositories
+    result = VoucherService(uma_repository, transaction_repository).validate_voucher(Decimal('0'), 'EMP1')
+
+    assert result['is_valid'] is False
+    assert result['message'] == 'Invalid amount'
+    assert result['remaining'] == Decimal('1103.696')
+    assert uma_repository.get_current_value.call_count == 1
+    transaction_repository.get_annual_total.assert_called_once_with(date.today().year, 'EMP1')
+
+def test_validate_invalid_amount_without_uma(repositories):
+    """Test a missing UMA is reported even when the amount is also invalid"""
+    uma_repository, transaction_repository = repositories
+    uma_repository.get_current_value.return_value = None
+    with pytest.raises(UMANotFoundError):
+        VoucherService(uma_repository, transaction_repository).validate_voucher(Decimal('-1'))